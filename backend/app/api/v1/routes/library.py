@@ -249,7 +249,7 @@ async def browse_library(
                 logger.info(f"Cleared cache for path: {path} due to refresh request")
             
             # Get directory listing from storage provider and cache it
-            items = storage_provider.list_directory(prefix=path)
+            items = storage_provider.list_directory(prefix=path, refresh=refresh)
             # Use longer TTL for archived content (30 days)
             cache_directory_listing(redis_conn, path, items, ttl=86400 * 30)
             logger.info(f"Fetched and cached directory listing for path: {path} ({len(items)} items)")
@@ -243,8 +243,10 @@ async def trigger_ingest(
         redis_conn = redis.from_url(redis_url)
         ingest_queue = Queue("ingest", connection=redis_conn)
         
-        # Get directory listing from storage provider
-        items = storage_provider.list_directory(prefix=request.path if request.path else None)
+        # Get a fresh directory listing from storage provider
+        items = storage_provider.list_directory(
+            prefix=request.path if request.path else None, refresh=True
+        )
         
         # Filter to only files (not folders)
         files = [item for item in items if not item.is_folder]
@@ -89,12 +89,20 @@ class Settings(BaseSettings):
     # Storage Provider Configuration
     STORAGE_PROVIDER: StorageProviderType
     FILESYSTEM_ROOT_PATH: str | None = None
+    FILESYSTEM_SCAN_WORKERS: int = 1  # >1 scans directories on worker threads
+    FILESYSTEM_DIR_CACHE_TTL: float = 2.0  # Seconds; 0 disables the cache
+    # Reuse listings of directories whose timestamps are unchanged during walks;
+    # turn off on NFS/SMB/FUSE mounts, where a cached stat can hide new files
+    FILESYSTEM_DIR_INDEX: bool = True
 
     # Dropbox Storage Provider Configuration
     DROPBOX_APP_KEY: str | None = None
     DROPBOX_APP_SECRET: str | None = None
     DROPBOX_REFRESH_TOKEN: str | None = None
     DROPBOX_ROOT_PATH: str = "/"
+    DROPBOX_DIR_CACHE_TTL: float = 30.0  # Seconds; 0 disables the cache
+    DROPBOX_COUNT_CACHE_TTL: float = 30.0  # Seconds; 0 disables the cache
+    DROPBOX_LIST_WORKERS: int = 1  # >1 lists top-level subfolders in parallel
 
     # S3 Binary Storage Configuration (for thumbnails/proxies)
     S3_ENDPOINT_URL: str | None = None
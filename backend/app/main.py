@@ -12,6 +12,7 @@ from app.api.v1.routes import private_router, public_router
 from app.api.v1.routes.auth import limiter
 from app.auth_utils import get_current_user
 from app.config import StorageProviderType, get_settings
+from app.storage_providers.dropbox import DropboxStorageProvider
 
 # Define required environment variables for each storage provider
 PROVIDER_REQUIRED_VARS = {
@@ -67,6 +68,9 @@ async def lifespan(app):
     logging.info("Application startup complete.")
     yield
 
+    # Close pooled Dropbox connections; a no-op if the provider was never used
+    DropboxStorageProvider.close_clients()
+
 
 app = FastAPI(
     title="Tagline Media Management API",
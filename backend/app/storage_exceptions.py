@@ -6,3 +6,13 @@ class StorageProviderException(Exception):
     """
 
     pass
+
+
+class StorageCursorResetException(StorageProviderException):
+    """
+    Raised when a change cursor is no longer accepted by the storage backend.
+
+    The caller should discard the cursor and list everything again.
+    """
+
+    pass
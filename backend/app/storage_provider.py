@@ -22,7 +22,12 @@ def get_storage_provider(
         assert (
             settings.FILESYSTEM_ROOT_PATH
         ), "FILESYSTEM_ROOT_PATH must be set for filesystem provider"
-        return FilesystemStorageProvider(root_path=settings.FILESYSTEM_ROOT_PATH)
+        return FilesystemStorageProvider(
+            root_path=settings.FILESYSTEM_ROOT_PATH,
+            scan_workers=settings.FILESYSTEM_SCAN_WORKERS,
+            dir_cache_ttl=settings.FILESYSTEM_DIR_CACHE_TTL,
+            dir_index=settings.FILESYSTEM_DIR_INDEX,
+        )
     elif provider_type == StorageProviderType.DROPBOX:
         assert (
             settings.DROPBOX_APP_KEY
@@ -38,6 +43,9 @@ def get_storage_provider(
             app_key=settings.DROPBOX_APP_KEY,
             app_secret=settings.DROPBOX_APP_SECRET,
             refresh_token=settings.DROPBOX_REFRESH_TOKEN,
+            dir_cache_ttl=settings.DROPBOX_DIR_CACHE_TTL,
+            count_cache_ttl=settings.DROPBOX_COUNT_CACHE_TTL,
+            list_workers=settings.DROPBOX_LIST_WORKERS,
         )
     # Add other providers here as elif blocks
     else:
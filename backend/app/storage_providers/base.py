@@ -1,11 +1,87 @@
-from typing import Iterable, List, Optional, Protocol
+import mimetypes
+import posixpath
+import re
+from functools import lru_cache
+from operator import methodcaller
+from typing import Callable, Iterable, List, Optional, Protocol
 
 from app.schemas import StoredMediaObject
 
+# Default bytes per chunk yielded by iter_object_bytes, in the protocol and in
+# every provider
+OBJECT_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=128)
+def compile_regex(pattern: str) -> re.Pattern:
+    """Compile a listing filter regex, reusing the result for repeat patterns.
+
+    Polling jobs pass the same few patterns on every call; this skips the
+    re module's own cache lookup path as well as recompilation.
+    """
+    return re.compile(pattern)
+
+
+# Characters that give a regex meaning beyond its literal text
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+@lru_cache(maxsize=128)
+def compile_search(pattern: str) -> Callable[[str], object]:
+    """Return a predicate that is truthy wherever re.search(pattern) would match.
+
+    Anchored literal patterns (``^text``, ``text$``, ``^text$``) are answered by
+    str.startswith / str.endswith / set membership, which skip the regex engine
+    and the match object it allocates. ``$`` also matches before a final
+    newline, so that case is checked too. Anything else, including unanchored
+    literals that re already scans for quickly, uses the compiled pattern.
+    """
+    anchored_start = pattern.startswith("^")
+    anchored_end = pattern.endswith("$")
+    literal = pattern[anchored_start : len(pattern) - anchored_end]
+    if (anchored_start or anchored_end) and not _REGEX_METACHARACTERS.intersection(
+        literal
+    ):
+        if anchored_start and anchored_end:
+            return frozenset((literal, literal + "\n")).__contains__
+        if anchored_start:
+            return methodcaller("startswith", literal)
+        return methodcaller("endswith", (literal, literal + "\n"))
+    return compile_regex(pattern).search
+
+
+@lru_cache(maxsize=512)
+def _guess_mimetype_for_suffix(suffix: str) -> Optional[str]:
+    return mimetypes.guess_type("x" + suffix)[0]
+
+
+def guess_mimetype(object_key: str) -> Optional[str]:
+    """Return the MIME type mimetypes.guess_type gives for `object_key`.
+
+    Listings hold thousands of keys but only a handful of extensions, so the
+    lookup is cached by extension. Keys whose type depends on more than their
+    last extension (compressed archives such as .tar.gz, or anything that could
+    parse as a URL) go straight to mimetypes.
+    """
+    suffix = posixpath.splitext(object_key)[1]
+    lowered = suffix.lower()
+    if (
+        ":" in object_key
+        or suffix in mimetypes.suffix_map
+        or lowered in mimetypes.suffix_map
+        or suffix in mimetypes.encodings_map
+        or lowered in mimetypes.encodings_map
+    ):
+        return mimetypes.guess_type(object_key)[0]
+    return _guess_mimetype_for_suffix(suffix)
+
 
 class DirectoryItem:
     """Represents a file or folder in a directory listing."""
-    
+
+    # Listings create one of these per entry; slots drop the per-instance dict
+    __slots__ = ("name", "is_folder", "object_key", "size", "last_modified", "mimetype")
+
     def __init__(
         self,
         name: str,
@@ -29,11 +105,13 @@ class StorageProviderBase(Protocol):
     def list_directory(
         self,
         prefix: Optional[str] = None,
+        refresh: bool = False,
     ) -> List[DirectoryItem]:
         """List files and folders at the given prefix path.
         
         Args:
             prefix: Path prefix to list (None for root directory)
+            refresh: Bypass any listing the provider has cached
             
         Returns:
             List of DirectoryItem objects representing files and folders
@@ -62,15 +140,24 @@ class StorageProviderBase(Protocol):
         self,
         prefix: Optional[str] = None,
         regex: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> int:
-        """Return the total count of media objects, optionally filtered."""
+        """Return the total count of media objects, optionally filtered.
+
+        If `limit` is given, counting stops once that many objects have matched,
+        so callers that only need "at least N" do not pay for a full scan.
+        """
         ...
 
-    def iter_object_bytes(self, object_key: str) -> Iterable[bytes]:
+    def iter_object_bytes(
+        self, object_key: str, chunk_size: int = OBJECT_CHUNK_SIZE
+    ) -> Iterable[bytes]:
         """Yield bytes of a single media object in chunks.
 
         Args:
             object_key: Key of the object to retrieve
+            chunk_size: Largest chunk to yield; consumers wanting finer
+                granularity can slice the chunks themselves
 
         Yields:
             Chunks of bytes from the object
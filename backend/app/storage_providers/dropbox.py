@@ -1,15 +1,192 @@
-import mimetypes
+import asyncio
+import hashlib
 import os
+import random
 import re
-from typing import Iterable, List, Optional, cast
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 import dropbox
-from dropbox.exceptions import ApiError, RateLimitError
-from dropbox.files import FileMetadata, FolderMetadata, ListFolderResult
+import requests
+from dropbox.exceptions import ApiError, InternalServerError, RateLimitError
+from dropbox.files import (
+    DeletedMetadata,
+    FileMetadata,
+    FolderMetadata,
+    ListFolderContinueError,
+    ListFolderResult,
+    Metadata,
+)
+from requests.exceptions import (
+    ConnectionError as RequestsConnectionError,
+    Timeout as RequestsTimeout,
+)
 
 from app.schemas import StoredMediaObject
-from app.storage_exceptions import StorageProviderException
-from app.storage_providers.base import DirectoryItem, StorageProviderBase
+from app.storage_exceptions import (
+    StorageCursorResetException,
+    StorageProviderException,
+)
+from app.storage_providers.base import (
+    OBJECT_CHUNK_SIZE,
+    DirectoryItem,
+    StorageProviderBase,
+    compile_search,
+    guess_mimetype,
+)
+
+# Largest page size accepted by files/list_folder
+LIST_FOLDER_PAGE_LIMIT = 2000
+
+# files/list_folder options for listings that only need file paths: the largest
+# pages and nothing beyond basic metadata. Non-downloadable files stay in, as in
+# every other listing, so counts agree with list_media_objects. Spelled out so a
+# change in SDK defaults cannot grow the payload or change the count.
+COUNT_LIST_OPTIONS: Dict[str, Any] = {
+    "limit": LIST_FOLDER_PAGE_LIMIT,
+    "include_media_info": False,
+    "include_deleted": False,
+    "include_has_explicit_shared_members": False,
+    "include_non_downloadable_files": True,
+}
+
+# Attempts per Dropbox call before a rate limit or transient error is allowed to surface
+RATE_LIMIT_MAX_ATTEMPTS = 5
+
+# Upper bound, in seconds, on the wait between two attempts (before jitter)
+RETRY_MAX_BACKOFF = 60.0
+
+# Failures worth retrying without a server hint: all calls made here are reads
+TRANSIENT_ERRORS = (InternalServerError, RequestsConnectionError, RequestsTimeout)
+
+# Connections kept alive per Dropbox host by the shared HTTP session
+HTTP_POOL_SIZE = 16
+
+# Seconds a list_directory result is served from memory before Dropbox is asked again
+DIR_CACHE_TTL = 30.0
+
+# Most list_directory results kept in memory
+DIR_CACHE_ENTRIES = 1024
+
+# Most cursor-backed file indexes kept for unfiltered counts; each holds the
+# path of every file under its list path
+FILE_INDEX_ENTRIES = 16
+
+# Seconds a count() result is reused before Dropbox is walked again
+COUNT_CACHE_TTL = 30.0
+
+# Most count() results kept in memory; keys come from callers' filters
+COUNT_CACHE_ENTRIES = 256
+
+# Jitter source for retry waits; seeded from the OS, so separate worker processes
+# never draw the same sequence
+_jitter = random.SystemRandom()
+
+T = TypeVar("T")
+
+
+def _strip_anchored_prefix(regex: str, prefix: str) -> Optional[re.Pattern]:
+    """Compile what is left of `regex` after a leading ``^<prefix>``.
+
+    count() already checks the prefix with startswith, so a regex that opens by
+    matching that same literal prefix only needs its remainder run from the end
+    of the prefix. Returns None when the regex does not have that shape, or when
+    splitting it could change its meaning (top-level alternation, a quantifier
+    applying to the last prefix character).
+    """
+    anchored = "^" + re.escape(prefix)
+    if not regex.startswith(anchored) or "|" in regex:
+        return None
+    remainder = regex[len(anchored) :]
+    if remainder[:1] in ("*", "+", "?", "{"):
+        return None
+    try:
+        return re.compile(remainder)
+    except re.error:
+        return None
+
+
+def _count_matching(
+    entries: List[Metadata],
+    root: str,
+    root_path: str,
+    prefix: Optional[str],
+    regex_test: Optional[Callable[[str], object]],
+    limit: Optional[int] = None,
+) -> int:
+    """Count the files in a list_folder page that pass the count() filters.
+
+    This is the per-entry hot loop of count(), kept as a standalone function so
+    every name it touches is a local. Object keys are path_display with `root`
+    stripped off, or relative to `root_path` where the casing differs, as in the
+    listing methods; `prefix` is compared against them without a leading slash.
+    `regex_test` is a predicate run on each object key (see compile_search).
+    Counting stops once `limit` matches have been seen.
+    """
+    file_metadata = FileMetadata
+    relpath = os.path.relpath
+    root_len = len(root)
+
+    # Generator expressions feeding sum(): the accumulator runs in C, and the
+    # conditions short-circuit from cheapest to most expensive
+    keys = (
+        path[root_len:] if path.startswith(root) else relpath(path, root_path)
+        for path in (
+            entry.path_display
+            for entry in entries
+            # The SDK never subclasses FileMetadata, so an identity check suffices
+            if type(entry) is file_metadata
+        )
+    )
+    matches = (
+        1
+        for key in keys
+        # Apply prefix filter strictly (covers cases where list_path was broad)
+        if (not prefix or key.startswith(prefix))
+        # Apply regex filter if provided
+        and (regex_test is None or regex_test(key))
+    )
+    return sum(islice(matches, limit))
+
+
+def _stored_media_object(entry: FileMetadata, object_key: str) -> StoredMediaObject:
+    """Build the StoredMediaObject for a Dropbox file entry.
+
+    Each SDK attribute read goes through a Python-level descriptor, so every
+    field is read once.
+    """
+    server_modified = entry.server_modified
+    client_modified = getattr(entry, "client_modified", None)
+    return StoredMediaObject(
+        object_key=object_key,
+        last_modified=server_modified.isoformat() if server_modified else None,
+        metadata={
+            "size": entry.size,
+            "content_hash": entry.content_hash,
+            "rev": getattr(entry, "rev", None),
+            "client_modified": (
+                client_modified.isoformat() if client_modified is not None else None
+            ),
+            "mimetype": guess_mimetype(object_key),
+        },
+    )
 
 
 class DropboxStorageProvider(StorageProviderBase):
@@ -21,30 +198,287 @@ class DropboxStorageProvider(StorageProviderBase):
 
     provider_name: str = "Dropbox"
 
+    # Providers are created per request, so the cursor-backed file indexes used
+    # by unfiltered counts live on the class, least recently used first:
+    # (account, lowercased list path) -> (cursor, file paths). The account is in
+    # the key, so providers on different Dropbox accounts never share a cursor.
+    _file_index: "OrderedDict[Tuple[str, str], Tuple[str, Set[str]]]" = OrderedDict()
+    _file_index_lock = threading.Lock()
+
+    # Recent list_directory results, shared for the same reason, least recently
+    # used first: (account, root path, lowercased list path) -> (monotonic time
+    # stored, items).
+    _dir_cache: (
+        "OrderedDict[Tuple[str, str, str], Tuple[float, List[DirectoryItem]]]"
+    ) = OrderedDict()
+    _dir_cache_lock = threading.Lock()
+
+    # Recent count() results, least recently used first:
+    # (account, root path, prefix, regex, limit) -> (monotonic time stored, count)
+    _count_cache: "OrderedDict[tuple, Tuple[float, int]]" = OrderedDict()
+    _count_cache_lock = threading.Lock()
+
+    # SDK clients by (app key, app secret, refresh token), so the access token and
+    # the pooled keep-alive connections outlive any one request. All clients share
+    # one certificate-pinned HTTP session, so sockets are capped process-wide.
+    _clients: Dict[Tuple[str, str, str], dropbox.Dropbox] = {}
+    _clients_lock = threading.Lock()
+    _session: Optional[requests.Session] = None
+
     def __init__(
         self,
         root_path: str,
         app_key: str,
         app_secret: str,
         refresh_token: str,
+        dir_cache_ttl: float = DIR_CACHE_TTL,
+        count_cache_ttl: float = COUNT_CACHE_TTL,
+        list_workers: int = 1,
     ):
-        """Initialize Dropbox provider with necessary credentials and root path."""
+        """Initialize Dropbox provider with necessary credentials and root path.
+
+        `dir_cache_ttl` is how long, in seconds, list_directory results are reused
+        without asking Dropbox again, and `count_cache_ttl` the same for count()
+        results; 0 disables either cache. With `list_workers`
+        above 1, all_media_objects lists top-level subfolders in parallel.
+        """
         self.root_path = root_path
-        self.dbx = dropbox.Dropbox(
-            app_key=app_key,
-            app_secret=app_secret,
-            oauth2_refresh_token=refresh_token,
+        # path_display values under the root start with this; slicing it off
+        # gives the object key
+        self._root_prefix = root_path.rstrip("/") + "/"
+        self.dir_cache_ttl = dir_cache_ttl
+        self.count_cache_ttl = count_cache_ttl
+        self.list_workers = list_workers
+        # Identifies the Dropbox account in cache keys without keeping the token
+        self._account = hashlib.sha256(
+            f"{app_key}\0{refresh_token}".encode()
+        ).hexdigest()
+        key = (app_key, app_secret, refresh_token)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                cls = type(self)
+                if cls._session is None:
+                    cls._session = dropbox.create_session(
+                        max_connections=HTTP_POOL_SIZE
+                    )
+                # Rate limit and server error retries are handled by
+                # _call_with_retry (bounded, jittered) rather than the SDK's own
+                # loops, which would multiply with ours.
+                client = self._clients[key] = dropbox.Dropbox(
+                    app_key=app_key,
+                    app_secret=app_secret,
+                    oauth2_refresh_token=refresh_token,
+                    max_retries_on_error=0,
+                    max_retries_on_rate_limit=0,
+                    session=cls._session,
+                )
+        self.dbx = client
+
+    @classmethod
+    def close_clients(cls) -> None:
+        """Drop the shared SDK clients and close their pooled connections."""
+        with cls._clients_lock:
+            cls._clients.clear()
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
+    def _call_with_retry(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call a Dropbox SDK method, backing off and retrying on transient errors.
+
+        Waits use "full jitter": a uniform random time up to an exponentially
+        growing ceiling (1s, 2s, 4s, ... capped at RETRY_MAX_BACKOFF), so
+        concurrent workers spread their retries out instead of retrying in
+        lockstep. On a rate limit the wait is never shorter than the Retry-After
+        Dropbox sends. The last error is re-raised after RATE_LIMIT_MAX_ATTEMPTS
+        attempts, keeping a long listing alive through transient trouble without
+        hanging forever.
+        """
+        for attempt in range(RATE_LIMIT_MAX_ATTEMPTS):
+            try:
+                return fn(*args, **kwargs)
+            except (RateLimitError, *TRANSIENT_ERRORS) as e:
+                if attempt == RATE_LIMIT_MAX_ATTEMPTS - 1:
+                    raise
+                delay = _jitter.uniform(0, min(RETRY_MAX_BACKOFF, 2**attempt))
+                if isinstance(e, RateLimitError) and e.backoff:
+                    delay = max(e.backoff, delay)
+                time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _list_folder_pages(
+        self, list_path: str, recursive: bool = True, **list_kwargs
+    ) -> Iterator[ListFolderResult]:
+        """Yield the pages of a folder listing, prefetching continuations.
+
+        While the caller processes one page, the next `files_list_folder_continue`
+        call is already running on a background thread, so network round-trips
+        overlap with local entry processing. At most one request is in flight.
+        Extra keyword arguments are passed through to `files_list_folder`;
+        continuation pages inherit them from the cursor.
+        """
+        res = cast(
+            ListFolderResult,
+            self._call_with_retry(
+                self.dbx.files_list_folder,
+                list_path,
+                recursive=recursive,
+                **list_kwargs,
+            ),
         )
+        return self._follow_pages(res)
+
+    def _follow_pages(self, res: ListFolderResult) -> Iterator[ListFolderResult]:
+        """Yield `res` and every page after it, prefetching continuations."""
+        if not res.has_more:
+            yield res
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while True:
+                next_page: Optional[Future] = (
+                    executor.submit(
+                        self._call_with_retry,
+                        self.dbx.files_list_folder_continue,
+                        res.cursor,
+                    )
+                    if res.has_more
+                    else None
+                )
+                yield res
+                if next_page is None:
+                    return
+                res = cast(ListFolderResult, next_page.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _list_subtree_files(self, list_path: str) -> List[FileMetadata]:
+        """Return every file under list_path from one recursive listing."""
+        return [
+            entry
+            for res in self._list_folder_pages(list_path, recursive=True)
+            for entry in res.entries
+            if type(entry) is FileMetadata
+        ]
+
+    def _iter_files_parallel(self, list_path: str) -> Iterator[FileMetadata]:
+        """Yield every file under list_path, listing subfolders in parallel.
+
+        The top level is listed on its own: its files are yielded straight away,
+        and each subfolder is listed recursively on one of `list_workers` threads,
+        each call retrying rate limits on its own. Subtrees are yielded in folder
+        order, so a subtree that finishes early is held in memory until the ones
+        before it are done. This is only worth it for a few large subtrees;
+        many small folders cost one request each instead of sharing pages.
+        """
+        folders: List[str] = []
+        for res in self._list_folder_pages(list_path, recursive=False):
+            for entry in res.entries:
+                entry_type = type(entry)
+                if entry_type is FileMetadata:
+                    yield entry
+                elif entry_type is FolderMetadata:
+                    folders.append(entry.path_lower)
+        if not folders:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.list_workers, len(folders)))
+        try:
+            subtrees = [
+                executor.submit(self._list_subtree_files, folder) for folder in folders
+            ]
+            for subtree in subtrees:
+                yield from subtree.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count_all_files(self, list_path: str) -> int:
+        """Count every file under list_path using a stored list_folder cursor.
+
+        The first call lists the whole tree and remembers the cursor together with
+        the set of file paths seen. Later calls only fetch the changes since that
+        cursor and apply them to the set, so repeat counts cost O(changes) instead
+        of a full listing. A reset cursor falls back to a fresh listing.
+
+        Dropbox is only called with the lock released. Stored sets are never
+        changed in place: changes go into a copy, stored with its cursor, so a
+        concurrent call sees either the old pair or the new one.
+
+        The set is needed because a delta does not say whether a file entry is
+        new or modified, nor whether a deleted path was a file or a folder; only
+        the FILE_INDEX_ENTRIES most recently used indexes are kept.
+        """
+        key = (self._account, list_path.lower())
+        with self._file_index_lock:
+            state = self._file_index.get(key)
+
+        if state is not None:
+            cursor, files = state
+            changes: List[Metadata] = []
+            try:
+                has_more = True
+                while has_more:
+                    res = cast(
+                        ListFolderResult,
+                        self._call_with_retry(
+                            self.dbx.files_list_folder_continue, cursor
+                        ),
+                    )
+                    changes.extend(res.entries)
+                    cursor, has_more = res.cursor, res.has_more
+            except ApiError as e:
+                if not (e.error and e.error.is_reset()):
+                    raise
+                state = None
+            else:
+                if changes:
+                    files = set(files)
+                for entry in changes:
+                    entry_type = type(entry)
+                    if entry_type is FileMetadata:
+                        files.add(entry.path_lower)
+                    elif entry_type is DeletedMetadata:
+                        path = entry.path_lower
+                        if path in files:
+                            files.discard(path)
+                        else:
+                            # A deleted folder takes all its files with it
+                            folder = path + "/"
+                            files.difference_update(
+                                [f for f in files if f.startswith(folder)]
+                            )
+
+        if state is None:
+            files = set()
+            cursor = ""
+            for res in self._list_folder_pages(list_path, **COUNT_LIST_OPTIONS):
+                files.update(
+                    entry.path_lower
+                    for entry in res.entries
+                    if type(entry) is FileMetadata
+                )
+                cursor = res.cursor
+
+        with self._file_index_lock:
+            self._file_index[key] = (cursor, files)
+            self._file_index.move_to_end(key)
+            if len(self._file_index) > FILE_INDEX_ENTRIES:
+                self._file_index.popitem(last=False)
+        return len(files)
 
     def list_directory(
         self,
         prefix: Optional[str] = None,
+        refresh: bool = False,
     ) -> List[DirectoryItem]:
         """List files and folders at the given prefix path.
-        
+
         Args:
             prefix: Path prefix to list (None for root directory)
-            
+            refresh: Ask Dropbox even if a recent listing is cached
+
         Returns:
             List of DirectoryItem objects representing files and folders
         """
@@ -57,60 +491,96 @@ class DropboxStorageProvider(StorageProviderBase):
             else:
                 # No prefix, use root path
                 list_path = self.root_path
-            
+
             # Special case: Dropbox root directory must be empty string
             if list_path == "/":
                 list_path = ""
 
-            items: List[DirectoryItem] = []
-            
+            # Serve recently listed directories from memory
+            cache_key = (self._account, self.root_path, list_path.lower())
+            if self.dir_cache_ttl > 0 and not refresh:
+                with self._dir_cache_lock:
+                    cached = self._dir_cache.get(cache_key)
+                    if cached and time.monotonic() - cached[0] < self.dir_cache_ttl:
+                        self._dir_cache.move_to_end(cache_key)
+                        return list(cached[1])
+
+            # Folders and files are collected apart, so each only needs sorting
+            # by name afterwards
+            folders: List[DirectoryItem] = []
+            files: List[DirectoryItem] = []
+
             # List the directory (non-recursive to get immediate children only)
             res = cast(
                 ListFolderResult,
-                self.dbx.files_list_folder(list_path, recursive=False),
+                self._call_with_retry(
+                    self.dbx.files_list_folder, list_path, recursive=False
+                ),
             )
 
+            # Bind hot names locally and dispatch on exact type: the SDK never
+            # subclasses its metadata types, and `is` is cheaper than isinstance
+            file_metadata = FileMetadata
+            folder_metadata = FolderMetadata
+            guess_mime = guess_mimetype
+            relpath = os.path.relpath
+            root_prefix = self._root_prefix
+            root_len = len(root_prefix)
+
             for entry in res.entries:
-                if isinstance(entry, FolderMetadata):
+                entry_type = type(entry)
+                if entry_type is folder_metadata:
                     # This is a folder
-                    items.append(DirectoryItem(
-                        name=entry.name,
-                        is_folder=True,
-                        object_key=None,  # Folders don't have object keys
-                        size=None,
-                        last_modified=None,
-                        mimetype=None,
-                    ))
-                elif isinstance(entry, FileMetadata):
+                    folders.append(
+                        DirectoryItem(
+                            name=entry.name,
+                            is_folder=True,
+                            object_key=None,  # Folders don't have object keys
+                            size=None,
+                            last_modified=None,
+                            mimetype=None,
+                        )
+                    )
+                elif entry_type is file_metadata:
                     # This is a file - calculate object key as relative path from root
-                    if self.root_path == "/":
-                        # Root is Dropbox root, use full path without leading slash
-                        rel_path = entry.path_display.lstrip("/")
+                    path = entry.path_display
+                    if path.startswith(root_prefix):
+                        # Strip the root folder off (never leaves a leading "/")
+                        rel_path = path[root_len:]
                     else:
-                        # Root is subfolder, calculate relative path
-                        rel_path = os.path.relpath(entry.path_display, self.root_path)
-                        rel_path = rel_path.lstrip("/")
-                    
-                    mime_type, _ = mimetypes.guess_type(rel_path)
+                        # Casing differs from root_path; fall back to relpath
+                        rel_path = relpath(path, self.root_path)
+
+                    mime_type = guess_mime(rel_path)
+                    server_modified = entry.server_modified
                     last_modified = (
-                        entry.server_modified.isoformat()
-                        if entry.server_modified
-                        else None
+                        server_modified.isoformat() if server_modified else None
+                    )
+
+                    files.append(
+                        DirectoryItem(
+                            name=entry.name,
+                            is_folder=False,
+                            object_key=rel_path,
+                            size=entry.size,
+                            last_modified=last_modified,
+                            mimetype=mime_type,
+                        )
                     )
-                    
-                    items.append(DirectoryItem(
-                        name=entry.name,
-                        is_folder=False,
-                        object_key=rel_path,
-                        size=entry.size,
-                        last_modified=last_modified,
-                        mimetype=mime_type,
-                    ))
 
             # Sort items: folders first, then files, both alphabetically
-            items.sort(key=lambda x: (not x.is_folder, x.name.lower()))
-            
-            return items
+            folders.sort(key=lambda x: x.name.lower())
+            files.sort(key=lambda x: x.name.lower())
+            items = folders + files
+
+            if self.dir_cache_ttl > 0:
+                with self._dir_cache_lock:
+                    self._dir_cache[cache_key] = (time.monotonic(), items)
+                    self._dir_cache.move_to_end(cache_key)
+                    if len(self._dir_cache) > DIR_CACHE_ENTRIES:
+                        self._dir_cache.popitem(last=False)
+
+            return list(items)
 
         except RateLimitError as e:
             raise StorageProviderException("Dropbox rate limit exceeded") from e
@@ -142,73 +612,57 @@ class DropboxStorageProvider(StorageProviderBase):
                 list_path = os.path.join(self.root_path, prefix_path)
 
             # Compile regex pattern if provided
-            regex_pattern = re.compile(regex) if regex else None
-
-            # Dropbox API returns up to 2,000 entries per call; handle pagination
+            regex_search = compile_search(regex) if regex else None
+
+            # Bind hot names locally for the per-entry loop
+            file_metadata = FileMetadata
+            to_stored = _stored_media_object
+            relpath = os.path.relpath
+            root_prefix = self._root_prefix
+            root_len = len(root_prefix)
+
+            # Dropbox API returns up to 2,000 entries per call; handle pagination,
+            # stopping as soon as the requested window has been filled
+            wanted = offset + limit
             results: List[StoredMediaObject] = []
             has_more = True
             cursor = None
 
-            while has_more and len(results) < (offset + limit):
+            while has_more and len(results) < wanted:
                 if cursor:
                     res = cast(
-                        ListFolderResult, self.dbx.files_list_folder_continue(cursor)
+                        ListFolderResult,
+                        self._call_with_retry(
+                            self.dbx.files_list_folder_continue, cursor
+                        ),
                     )
                 else:
                     res = cast(
                         ListFolderResult,
-                        self.dbx.files_list_folder(list_path, recursive=True),
+                        self._call_with_retry(
+                            self.dbx.files_list_folder, list_path, recursive=True
+                        ),
                     )
 
                 for entry in res.entries:
-                    if isinstance(entry, FileMetadata):
+                    if type(entry) is file_metadata:
                         # Calculate object key as relative path from root
-                        if self.root_path == "/":
-                            # Root is Dropbox root, use full path without leading slash
-                            rel_path = entry.path_display.lstrip("/")
+                        path = entry.path_display
+                        if path.startswith(root_prefix):
+                            # Strip the root folder off (never leaves a leading "/")
+                            rel_path = path[root_len:]
                         else:
-                            # Root is subfolder, calculate relative path
-                            rel_path = os.path.relpath(entry.path_display, self.root_path)
-                            rel_path = rel_path.lstrip("/")
+                            # Casing differs from root_path; fall back to relpath
+                            rel_path = relpath(path, self.root_path)
 
                         # Apply regex filter if provided
-                        if regex_pattern and not regex_pattern.search(rel_path):
+                        if regex_search and not regex_search(rel_path):
                             continue
 
-                        mime_type, _ = mimetypes.guess_type(rel_path)
-                        last_modified = (
-                            entry.server_modified.isoformat()
-                            if entry.server_modified
-                            else None
-                        )
-
                         # Create StoredMediaObject with Dropbox metadata
-                        results.append(
-                            StoredMediaObject(
-                                object_key=rel_path,
-                                last_modified=last_modified,
-                                metadata={
-                                    "size": entry.size,
-                                    "content_hash": getattr(
-                                        entry, "content_hash", None
-                                    ),
-                                    "rev": getattr(entry, "rev", None),
-                                    "client_modified": (
-                                        (
-                                            cm.isoformat()
-                                            if (
-                                                cm := getattr(
-                                                    entry, "client_modified", None
-                                                )
-                                            )
-                                            is not None
-                                            else None
-                                        )
-                                    ),
-                                    "mimetype": mime_type,
-                                },
-                            )
-                        )
+                        results.append(to_stored(entry, rel_path))
+                        if len(results) >= wanted:
+                            break
 
                 has_more = res.has_more
                 cursor = res.cursor
@@ -240,81 +694,129 @@ class DropboxStorageProvider(StorageProviderBase):
                 list_path = os.path.join(self.root_path, prefix_path)
             else:
                 list_path = self.root_path
-            
+
             # Special case: Dropbox root directory must be empty string
             if list_path == "/":
                 list_path = ""
 
             # Compile regex pattern if provided
-            regex_pattern = re.compile(regex) if regex else None
+            regex_search = compile_search(regex) if regex else None
+
+            # Bind hot names locally for the per-entry loop
+            file_metadata = FileMetadata
+            to_stored = _stored_media_object
+            relpath = os.path.relpath
+            root_prefix = self._root_prefix
+            root_len = len(root_prefix)
+
+            # Dropbox API returns up to 2,000 entries per call; the next page is
+            # fetched in the background while this one is being yielded. With
+            # several list workers, top-level subfolders are listed side by side.
+            if self.list_workers > 1:
+                entries: Iterable[Metadata] = self._iter_files_parallel(list_path)
+            else:
+                entries = (
+                    entry
+                    for res in self._list_folder_pages(list_path, recursive=True)
+                    for entry in res.entries
+                )
+            for entry in entries:
+                if type(entry) is file_metadata:
+                    # Calculate object key as relative path from root
+                    path = entry.path_display
+                    if path.startswith(root_prefix):
+                        # Strip the root folder off (never leaves a leading "/")
+                        rel_path = path[root_len:]
+                    else:
+                        # Casing differs from root_path; fall back to relpath
+                        rel_path = relpath(path, self.root_path)
 
-            # Dropbox API returns up to 2,000 entries per call; handle pagination
-            has_more = True
-            cursor = None
+                    # Apply regex filter if provided
+                    if regex_search and not regex_search(rel_path):
+                        continue
 
-            while has_more:
-                if cursor:
-                    res = cast(
-                        ListFolderResult, self.dbx.files_list_folder_continue(cursor)
-                    )
-                else:
-                    res = cast(
+                    # Yield StoredMediaObject with Dropbox metadata
+                    yield to_stored(entry, rel_path)
+
+        except RateLimitError as e:
+            raise StorageProviderException("Dropbox rate limit exceeded") from e
+        except ApiError as e:
+            raise StorageProviderException(f"Dropbox API error: {e}") from e
+        except Exception as e:
+            raise StorageProviderException(f"Dropbox error: {e}") from e
+
+    def all_media_objects_delta(
+        self,
+        cursor: Optional[str] = None,
+        prefix: Optional[str] = None,
+        regex: Optional[str] = None,
+    ) -> Tuple[List[StoredMediaObject], List[str], str]:
+        """
+        Return the files that changed since `cursor`, plus a cursor for next time.
+
+        Without a cursor every file under the root path (or `prefix`) is returned,
+        as with all_media_objects. Passing the returned cursor back fetches only
+        what was added, modified or deleted since; the cursor remembers the listed
+        path, so `prefix` is ignored then. The result is (added or modified
+        objects, object keys of deleted entries, new cursor). A deleted folder is
+        reported once, by its own key, and takes everything under it with it.
+        `regex` filters the objects but not the deleted keys.
+        Raises StorageCursorResetException if Dropbox no longer accepts the
+        cursor; call again without one to start over.
+        """
+        try:
+            if cursor:
+                pages = self._follow_pages(
+                    cast(
                         ListFolderResult,
-                        self.dbx.files_list_folder(list_path, recursive=True),
+                        self._call_with_retry(
+                            self.dbx.files_list_folder_continue, cursor
+                        ),
                     )
-
+                )
+            else:
+                root = self._root_prefix
+                list_path = root + prefix.lstrip("/") if prefix else self.root_path
+                if list_path == "/":
+                    list_path = ""
+                pages = self._list_folder_pages(list_path, recursive=True)
+
+            regex_search = compile_search(regex) if regex else None
+            root_prefix = self._root_prefix
+            root_len = len(root_prefix)
+
+            changed: List[StoredMediaObject] = []
+            deleted: List[str] = []
+            new_cursor = cursor or ""
+            for res in pages:
                 for entry in res.entries:
-                    if isinstance(entry, FileMetadata):
-                        # Calculate object key as relative path from root
-                        if self.root_path == "/":
-                            # Root is Dropbox root, use full path without leading slash
-                            rel_path = entry.path_display.lstrip("/")
-                        else:
-                            # Root is subfolder, calculate relative path
-                            rel_path = os.path.relpath(entry.path_display, self.root_path)
-                            rel_path = rel_path.lstrip("/")
-
-                        # Apply regex filter if provided
-                        if regex_pattern and not regex_pattern.search(rel_path):
-                            continue
-
-                        mime_type, _ = mimetypes.guess_type(rel_path)
-                        last_modified = (
-                            entry.server_modified.isoformat()
-                            if entry.server_modified
-                            else None
-                        )
+                    entry_type = type(entry)
+                    if entry_type is FileMetadata:
+                        path = entry.path_display
+                    elif entry_type is DeletedMetadata:
+                        path = entry.path_display or entry.path_lower
+                    else:
+                        continue
+                    if path.startswith(root_prefix):
+                        rel_path = path[root_len:]
+                    else:
+                        rel_path = os.path.relpath(path, self.root_path)
 
-                        # Yield StoredMediaObject with Dropbox metadata
-                        yield StoredMediaObject(
-                            object_key=rel_path,
-                            last_modified=last_modified,
-                            metadata={
-                                "size": entry.size,
-                                "content_hash": getattr(entry, "content_hash", None),
-                                "rev": getattr(entry, "rev", None),
-                                "client_modified": (
-                                    (
-                                        cm.isoformat()
-                                        if (
-                                            cm := getattr(
-                                                entry, "client_modified", None
-                                            )
-                                        )
-                                        is not None
-                                        else None
-                                    )
-                                ),
-                                "mimetype": mime_type,
-                            },
-                        )
+                    if entry_type is DeletedMetadata:
+                        deleted.append(rel_path)
+                    elif not regex_search or regex_search(rel_path):
+                        changed.append(_stored_media_object(entry, rel_path))
+                new_cursor = res.cursor
 
-                has_more = res.has_more
-                cursor = res.cursor
+            return changed, deleted, new_cursor
 
         except RateLimitError as e:
             raise StorageProviderException("Dropbox rate limit exceeded") from e
         except ApiError as e:
+            if isinstance(e.error, ListFolderContinueError) and e.error.is_reset():
+                raise StorageCursorResetException(
+                    "Dropbox cursor has expired; list again without one"
+                ) from e
             raise StorageProviderException(f"Dropbox API error: {e}") from e
         except Exception as e:
             raise StorageProviderException(f"Dropbox error: {e}") from e
@@ -322,19 +824,21 @@ class DropboxStorageProvider(StorageProviderBase):
     async def retrieve(self, object_key: str) -> bytes:
         """
         Retrieve the raw bytes of a file given its object key (relative path from root).
+        The blocking SDK download runs on a worker thread, so concurrent retrieves
+        overlap instead of stalling the event loop.
         """
+        return await asyncio.to_thread(self._retrieve_sync, object_key)
+
+    def _retrieve_sync(self, object_key: str) -> bytes:
+        """Download a file's bytes with the synchronous SDK; see retrieve()."""
         try:
-            # Remove leading slash from object key and join with root
-            rel_path = object_key.lstrip("/")
-            dropbox_path = os.path.join(self.root_path, rel_path)
-            
-            # Special case: if we're at Dropbox root, don't use empty string for file paths
-            if self.root_path == "/" and rel_path:
-                dropbox_path = "/" + rel_path
-            from typing import Any, Tuple
+            # Dropbox paths are always POSIX; the precomputed root prefix already
+            # ends in exactly one slash, including when the root is "/"
+            dropbox_path = self._root_prefix + object_key.lstrip("/")
 
             md_response = cast(
-                Tuple[FileMetadata, Any], self.dbx.files_download(dropbox_path)
+                Tuple[FileMetadata, Any],
+                self._call_with_retry(self.dbx.files_download, dropbox_path),
             )
             response = md_response[1]
             return response.content
@@ -349,11 +853,14 @@ class DropboxStorageProvider(StorageProviderBase):
         except Exception as e:
             raise StorageProviderException(f"Dropbox error: {e}") from e
 
-    def iter_object_bytes(self, object_key: str) -> Iterable[bytes]:
+    def iter_object_bytes(
+        self, object_key: str, chunk_size: int = OBJECT_CHUNK_SIZE
+    ) -> Iterable[bytes]:
         """Yield bytes of a single media object in chunks.
 
         Args:
             object_key: Key of the object to retrieve
+            chunk_size: Largest chunk to yield
 
         Yields:
             Chunks of bytes from the object
@@ -363,28 +870,22 @@ class DropboxStorageProvider(StorageProviderBase):
             StorageProviderException: For other errors
         """
         try:
-            # Remove leading slash from object key and join with root
-            rel_path = object_key.lstrip("/")
-            dropbox_path = os.path.join(self.root_path, rel_path)
-            
-            # Special case: if we're at Dropbox root, don't use empty string for file paths
-            if self.root_path == "/" and rel_path:
-                dropbox_path = "/" + rel_path
-            from typing import Any, Tuple
+            # Dropbox paths are always POSIX; the precomputed root prefix already
+            # ends in exactly one slash, including when the root is "/"
+            dropbox_path = self._root_prefix + object_key.lstrip("/")
 
             md_response = cast(
-                Tuple[FileMetadata, Any], self.dbx.files_download(dropbox_path)
+                Tuple[FileMetadata, Any],
+                self._call_with_retry(self.dbx.files_download, dropbox_path),
             )
             response = md_response[1]
 
-            # Yield response content in chunks
-            chunk_size = 4096  # 4KB chunks
-            content = response.content
-            if content is None:
-                raise StorageProviderException("Dropbox returned empty response")
-
-            for i in range(0, len(content), chunk_size):
-                yield content[i : i + chunk_size]
+            # Stream the body off the socket instead of buffering the whole file;
+            # the SDK leaves closing a streamed download to the caller
+            try:
+                yield from response.iter_content(chunk_size)
+            finally:
+                response.close()
 
         except ApiError as e:
             if e.error and e.error.is_path() and e.error.get_path().is_not_found():
@@ -399,75 +900,93 @@ class DropboxStorageProvider(StorageProviderBase):
         self,
         prefix: Optional[str] = None,
         regex: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> int:
         """
         Return the total count of media objects, optionally filtered by prefix and regex.
         Note: This requires paginating through all Dropbox entries matching the prefix,
-        which might be slow for very large directories.
+        which might be slow for very large directories. Pass `limit` to stop paging
+        as soon as that many matches have been found (the result is capped at it).
+        Results are reused for `count_cache_ttl` seconds, so polling UIs do not
+        trigger a walk each time.
         """
+        if self.count_cache_ttl <= 0:
+            return self._count_uncached(prefix, regex, limit)
+
+        cache_key = (self._account, self.root_path, prefix, regex, limit)
+        with self._count_cache_lock:
+            cached = self._count_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < self.count_cache_ttl:
+                self._count_cache.move_to_end(cache_key)
+                return cached[1]
+
+        count = self._count_uncached(prefix, regex, limit)
+        with self._count_cache_lock:
+            self._count_cache[cache_key] = (time.monotonic(), count)
+            self._count_cache.move_to_end(cache_key)
+            if len(self._count_cache) > COUNT_CACHE_ENTRIES:
+                self._count_cache.popitem(last=False)
+        return count
+
+    def _count_uncached(
+        self,
+        prefix: Optional[str],
+        regex: Optional[str],
+        limit: Optional[int],
+    ) -> int:
+        """Count media objects against Dropbox itself; see count()."""
         try:
-            # Compose the path to list
-            if prefix:
-                # Remove leading slash from prefix to avoid double-slash
-                prefix_path = prefix.lstrip("/")
-                list_path = os.path.join(self.root_path, prefix_path)
-            else:
-                list_path = self.root_path
-            
+            # Object keys are path_display with the root folder stripped off
+            root = self._root_prefix
+
+            # Compare prefixes against the slash-less object key directly
+            prefix_stripped = prefix.lstrip("/") if prefix else None
+
+            # Compose the path to list; Dropbox paths are always POSIX-style, so
+            # plain concatenation does what os.path.join did here
+            list_path = root + prefix_stripped if prefix else self.root_path
+
             # Special case: Dropbox root directory must be empty string
             if list_path == "/":
                 list_path = ""
 
-            # Compile regex pattern if provided
-            regex_pattern = re.compile(regex) if regex else None
-
-            count = 0
-            has_more = True
-            cursor = None
-
-            while has_more:
-                if cursor:
-                    res = cast(
-                        ListFolderResult, self.dbx.files_list_folder_continue(cursor)
-                    )
+            # Compile regex pattern once and bind its method for the hot loop. If
+            # it starts by matching the prefix itself, only run the remainder.
+            regex_test: Optional[Callable[[str], object]] = None
+            if regex:
+                remainder = (
+                    _strip_anchored_prefix(regex, prefix_stripped)
+                    if prefix_stripped
+                    else None
+                )
+                if remainder is not None and prefix_stripped:
+                    regex_test = partial(remainder.match, pos=len(prefix_stripped))
                 else:
-                    # Use path=list_path, recursive=True only makes sense if prefix is a directory
-                    # If prefix points to a file, list_folder might error or return empty.
-                    # We count only FileMetadata instances returned.
-                    res = cast(
-                        ListFolderResult,
-                        self.dbx.files_list_folder(list_path, recursive=True),
-                    )
+                    regex_test = compile_search(regex)
 
-                for entry in res.entries:
-                    if isinstance(entry, FileMetadata):
-                        # Calculate object key as relative path from root
-                        if self.root_path == "/":
-                            # Root is Dropbox root, use full path without leading slash
-                            rel_path = entry.path_display.lstrip("/")
-                        else:
-                            # Root is subfolder, calculate relative path
-                            try:
-                                rel_path = os.path.relpath(entry.path_display, self.root_path)
-                                rel_path = rel_path.lstrip("/")
-                            except ValueError:
-                                # Handle cases where entry is not under root_path
-                                continue
-
-                        # Apply prefix filter strictly (covers cases where list_path was broad)
-                        # Convert to object key format with leading slash for comparison
-                        obj_key = "/" + rel_path if rel_path else "/"
-                        if prefix is not None and not obj_key.startswith(prefix):
-                            continue
+            need_filter = bool(prefix_stripped) or regex_test is not None
 
-                        # Apply regex filter if provided
-                        if regex_pattern and not regex_pattern.search(rel_path):
-                            continue
+            if not need_filter and limit is None:
+                # Counting everything: serve it from the cursor-backed file index
+                return self._count_all_files(list_path)
 
-                        count += 1
+            count = 0
 
-                has_more = res.has_more
-                cursor = res.cursor
+            # Use path=list_path, recursive=True only makes sense if prefix is a
+            # directory. If prefix points to a file, list_folder might error or
+            # return empty. We count only FileMetadata instances returned, so ask
+            # for the largest pages and nothing beyond paths.
+            for res in self._list_folder_pages(list_path, **COUNT_LIST_OPTIONS):
+                count += _count_matching(
+                    res.entries,
+                    root,
+                    self.root_path,
+                    prefix_stripped,
+                    regex_test,
+                    None if limit is None else limit - count,
+                )
+                if limit is not None and count >= limit:
+                    break
 
             return count
 
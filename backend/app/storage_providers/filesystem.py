@@ -1,12 +1,116 @@
-import mimetypes
+import asyncio
 import os
-import re
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import (
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from app.schemas import StoredMediaObject
-from app.storage_providers.base import DirectoryItem, StorageProviderBase
+from app.storage_providers.base import (
+    OBJECT_CHUNK_SIZE,
+    DirectoryItem,
+    StorageProviderBase,
+    compile_search,
+    guess_mimetype,
+)
+
+# Seconds a list_directory result is served from memory while the directory's
+# own timestamps are unchanged; edits to files in place only show after this
+DIR_CACHE_TTL = 2.0
+
+# Most list_directory results kept in memory
+DIR_CACHE_ENTRIES = 1024
+
+# Most directory listings kept in memory for walks of unchanged directories
+DIR_INDEX_ENTRIES = 10_000
+
+# A listing is only reused if its directory last changed at least this long
+# before the scan, so a change within the same timestamp tick (coarse on some
+# network and FAT mounts) is never hidden behind an unchanged timestamp
+DIR_INDEX_MIN_AGE_NS = 2_000_000_000
+
+# Directories the parallel walk keeps scanning ahead of its caller, per worker
+SCAN_AHEAD_PER_WORKER = 4
+
+# Kinds of directory children recorded in a listing
+_DIR, _FILE, _OTHER, _LINK = range(4)
+
+# Objects handed over per batch by all_media_objects_async, and batches the
+# scanning thread may get ahead of its consumer
+ASYNC_BATCH_SIZE = 256
+ASYNC_QUEUE_BATCHES = 4
+
+# Most files whose formatted metadata is kept for later listings while unchanged
+METADATA_CACHE_ENTRIES = 100_000
+
+# (monotonic time stored, (mtime_ns, ctime_ns), items) in the list_directory cache
+_DirCacheEntry = Tuple[float, Tuple[int, int], List[DirectoryItem]]
+
+_fromtimestamp = datetime.fromtimestamp
+_UTC = timezone.utc
+
+
+def _open_nonblocking(path: str, flags: int) -> int:
+    """open() opener that cannot hang on a FIFO; no effect on regular files."""
+    return os.open(path, flags | getattr(os, "O_NONBLOCK", 0))
+
+
+@lru_cache(maxsize=4096)
+def _iso_utc(timestamp: float) -> str:
+    """Format a POSIX timestamp as an ISO 8601 UTC string, microseconds included.
+
+    datetime's C formatter beats a time.gmtime/printf version. Cached, since a
+    file's mtime and ctime are often equal and directories are listed again.
+    """
+    return _fromtimestamp(timestamp, _UTC).isoformat()
+
+
+class _FileEntry:
+    """The parts of os.DirEntry the walkers use, rebuilt from a directory listing.
+
+    Listings may come from the cache, so stat results are not kept beyond the
+    entry: every walk gets fresh entries and stats each file at most once.
+    """
+
+    __slots__ = ("name", "path", "_is_file", "_stat")
+
+    def __init__(self, name: str, path: str, is_file: Optional[bool]):
+        self.name = name
+        self.path = path
+        # None for symlinks, whose target is only checked when asked
+        self._is_file = is_file
+        self._stat: Optional[os.stat_result] = None
+
+    def stat(self) -> os.stat_result:
+        """Return os.stat() of the path, following symlinks; cached."""
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def is_file(self) -> bool:
+        """Whether this is a regular file, or a symlink to one."""
+        if self._is_file is None:
+            try:
+                self._is_file = stat_module.S_ISREG(self.stat().st_mode)
+            except OSError:
+                self._is_file = False
+        return self._is_file
 
 
 class FilesystemStorageProvider(StorageProviderBase):
@@ -18,22 +122,276 @@ class FilesystemStorageProvider(StorageProviderBase):
 
     provider_name: str = "Filesystem"
 
-    def __init__(self, root_path: Optional[str] = None):
+    # Providers are created per request, so formatted object fields are kept on
+    # the class, least recently used first: (root, full path) -> (stat signature,
+    # (last_modified, created, mimetype)). Immutable, so no caller can change
+    # what another is handed; the root is in the key as object keys depend on
+    # it. The signature is (inode, mtime_ns, ctime_ns, size); any change rebuilds.
+    _metadata_cache: "OrderedDict[Tuple[str, str], Tuple[tuple, tuple]]" = OrderedDict()
+    _metadata_cache_lock = threading.Lock()
+
+    # Directory listings, least recently used first: directory path ->
+    # ((mtime_ns, ctime_ns), [(child name, kind)]). Adding, removing or renaming
+    # an entry bumps both, and ctime cannot be set back the way mtime can, so a
+    # walk of an unchanged tree costs one stat per directory instead of a read.
+    _dir_index: "OrderedDict[str, Tuple[Tuple[int, int], List[Tuple[str, int]]]]" = (
+        OrderedDict()
+    )
+    _dir_index_lock = threading.Lock()
+
+    # Recent list_directory results, least recently used first: (root, directory
+    # path) -> _DirCacheEntry. Item object keys depend on the root, as above.
+    _dir_cache: "OrderedDict[Tuple[str, str], _DirCacheEntry]" = OrderedDict()
+    _dir_cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        root_path: Optional[str] = None,
+        scan_workers: int = 1,
+        dir_cache_ttl: float = DIR_CACHE_TTL,
+        dir_index: bool = True,
+    ):
+        """With `scan_workers` above 1, directories are scanned ahead of the
+        caller on that many threads, which pays off when stat calls are slow
+        (network or FUSE mounts). Results come back in the same order either way.
+        `dir_cache_ttl` is how long, in seconds, an unchanged directory's
+        list_directory result is reused; 0 disables the cache.
+        `dir_index` lets walks reuse directory listings while the directory's
+        timestamps are unchanged (see _list_dir); turn it off on network mounts
+        whose attribute cache can return a stale directory stat.
+        """
+        self.scan_workers = scan_workers
+        self.dir_cache_ttl = dir_cache_ttl
+        self.dir_index = dir_index
         self.root_path = Path(root_path or os.environ["FILESYSTEM_ROOT_PATH"]).resolve()
         if not self.root_path.is_dir():
             raise ValueError(
                 f"Filesystem root path '{self.root_path}' does not exist or is not a directory."
             )
+        # Per-file work joins plain strings; Path is kept for the public attribute
+        self._root_str = str(self.root_path)
+
+    def _iter_entries(
+        self,
+        prefix: Optional[str] = None,
+        stat: bool = False,
+        match: Optional[Callable[[str], object]] = None,
+    ) -> Iterator[Tuple[_FileEntry, str]]:
+        """Yield (entry, object key) for each non-directory whose key has `prefix`
+        and, if given, passes the `match` predicate.
+
+        Visits directories in the same order as os.walk, without following
+        directory symlinks and skipping directories that cannot be read, but
+        hands out entries that remember their file type and stat result, so
+        callers do not repeat those calls. Object keys are built by string
+        concatenation.
+
+        `prefix` is a plain string prefix, so "/a" matches "/a/x" and "/ab.jpg"
+        alike. Subdirectories whose keys can neither contain nor lead to a
+        match are never scanned, so a narrow prefix only reads its own subtree
+        and the directories on the way down to it. Pass `stat=True` when the
+        caller will stat every entry, so parallel scans can do it ahead of time.
+        """
+        prefix = prefix or ""
+        if self.scan_workers > 1:
+            return self._iter_entries_parallel(prefix, stat, match)
+        return self._iter_entries_serial(prefix, match)
+
+    def _list_dir(self, dirpath: str) -> Optional[List[Tuple[str, int]]]:
+        """Return (name, kind) for each child of a directory, or None if unreadable.
+
+        Kinds come from readdir's file type without following symlinks. With
+        `dir_index` on, the listing is served from _dir_index while the
+        directory's timestamps match. That trusts the directory's stat: on NFS,
+        SMB or FUSE mounts the client's attribute cache can report unchanged
+        timestamps after entries were added, so walks may miss new files until
+        the mount's attribute cache times out, unless the index is turned off.
+        """
+        version = None
+        if self.dir_index:
+            try:
+                dir_stat = os.stat(dirpath)
+            except OSError:
+                return None
+            version = (dir_stat.st_mtime_ns, dir_stat.st_ctime_ns)
+            with self._dir_index_lock:
+                cached = self._dir_index.get(dirpath)
+                if cached is not None and cached[0] == version:
+                    self._dir_index.move_to_end(dirpath)
+                    return cached[1]
+
+        scanned_at = time.time_ns()
+        listing = []
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        kind = _LINK
+                    elif entry.is_dir(follow_symlinks=False):
+                        kind = _DIR
+                    elif entry.is_file(follow_symlinks=False):
+                        kind = _FILE
+                    else:
+                        kind = _OTHER
+                    listing.append((entry.name, kind))
+        except OSError:
+            return None
+
+        if version is not None and scanned_at - max(version) >= DIR_INDEX_MIN_AGE_NS:
+            with self._dir_index_lock:
+                self._dir_index[dirpath] = (version, listing)
+                self._dir_index.move_to_end(dirpath)
+                if len(self._dir_index) > DIR_INDEX_ENTRIES:
+                    self._dir_index.popitem(last=False)
+        return listing
+
+    def _scan_dir(
+        self,
+        dirpath: str,
+        key_prefix: str,
+        prefix: str,
+        match: Optional[Callable[[str], object]],
+    ) -> Tuple[List[Tuple[_FileEntry, str]], List[Tuple[str, str]]]:
+        """Read one directory for _iter_entries.
+
+        Returns the matching non-directories as (entry, object key) and the
+        subdirectories worth walking as (path, key prefix). A directory that
+        cannot be read counts as empty.
+        """
+        listing = self._list_dir(dirpath)
+        if listing is None:
+            return [], []
+
+        dir_prefix = dirpath if dirpath.endswith("/") else dirpath + "/"
+        files = []
+        subdirs = []
+        for name, kind in listing:
+            path = dir_prefix + name
+            if kind == _DIR:
+                # Descend only if keys below can still match
+                subkey = key_prefix + name + "/"
+                if subkey.startswith(prefix) or prefix.startswith(subkey):
+                    subdirs.append((path, subkey))
+                continue
+            # Symlinks to directories are listed by os.walk but never entered
+            if kind == _LINK and os.path.isdir(path):
+                continue
+            rel_path = key_prefix + name
+            if rel_path.startswith(prefix) and (match is None or match(rel_path)):
+                is_file = None if kind == _LINK else kind == _FILE
+                files.append((_FileEntry(name, path, is_file), rel_path))
+        return files, subdirs
+
+    def _iter_entries_serial(
+        self, prefix: str, match: Optional[Callable[[str], object]]
+    ) -> Iterator[Tuple[_FileEntry, str]]:
+        stack = [(self._root_str, "/")]
+        while stack:
+            files, subdirs = self._scan_dir(*stack.pop(), prefix, match)
+            yield from files
+            # Reversed, so the first subdirectory is popped and walked next
+            stack.extend(reversed(subdirs))
+
+    def _iter_entries_parallel(
+        self, prefix: str, stat: bool, match: Optional[Callable[[str], object]]
+    ) -> Iterator[Tuple[_FileEntry, str]]:
+        """Walk like _iter_entries_serial, scanning directories on worker threads.
+
+        The next directories in walk order are kept scanning on the pool, at most
+        SCAN_AHEAD_PER_WORKER per worker, while the caller consumes results in
+        walk order. A caller that stops early leaves at most that many scans
+        done for nothing. Each worker holds at most one directory open at a time.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.scan_workers)
+        max_pending = self.scan_workers * SCAN_AHEAD_PER_WORKER
+
+        def scan(
+            dirpath: str, key_prefix: str
+        ) -> Tuple[List[Tuple[_FileEntry, str]], List[Tuple[str, str]]]:
+            files, subdirs = self._scan_dir(dirpath, key_prefix, prefix, match)
+            if stat:
+                # Entries cache the result; errors resurface in the caller
+                for entry, _ in files:
+                    try:
+                        entry.stat()
+                    except OSError:
+                        pass
+            return files, subdirs
+
+        # Directories still to walk, next one last: a scan in progress, or the
+        # (path, key prefix) of one not yet handed to the pool
+        stack: List[Union[Future, Tuple[str, str]]] = [(self._root_str, "/")]
+        pending = 0
+        try:
+            while stack:
+                # Hand the pool the next directories, from the top of the stack
+                # down, until enough are in flight
+                i = len(stack) - 1
+                while pending < max_pending and i >= 0:
+                    item = stack[i]
+                    if not isinstance(item, Future):
+                        stack[i] = executor.submit(scan, *item)
+                        pending += 1
+                    i -= 1
+                future = stack.pop()
+                pending -= 1
+                files, subdirs = future.result()
+                yield from files
+                stack.extend(reversed(subdirs))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _stored_media_object(
+        self, entry: _FileEntry, rel_path: str
+    ) -> StoredMediaObject:
+        """Build the StoredMediaObject for a file entry.
+
+        The entry is stat'ed every time, but while the stat signature matches the
+        last object built for the same path, its formatted fields are reused.
+        Every call returns a new object, so callers may change it freely.
+        """
+        stat = entry.stat()
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+        cache_key = (self._root_str, entry.path)
+        cache = self._metadata_cache
+        with self._metadata_cache_lock:
+            cached = cache.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                cache.move_to_end(cache_key)
+                fields = cached[1]
+            else:
+                fields = None
+
+        if fields is None:
+            fields = (
+                _iso_utc(stat.st_mtime),
+                _iso_utc(stat.st_ctime),
+                guess_mimetype(rel_path),
+            )
+            with self._metadata_cache_lock:
+                cache[cache_key] = (signature, fields)
+                cache.move_to_end(cache_key)
+                if len(cache) > METADATA_CACHE_ENTRIES:
+                    cache.popitem(last=False)
+
+        last_modified, created, mimetype = fields
+        return StoredMediaObject(
+            object_key=rel_path,
+            last_modified=last_modified,
+            metadata={"size": stat.st_size, "created": created, "mimetype": mimetype},
+        )
 
     def list_directory(
         self,
         prefix: Optional[str] = None,
+        refresh: bool = False,
     ) -> List[DirectoryItem]:
         """List files and folders at the given prefix path.
-        
+
         Args:
             prefix: Path prefix to list (None for root directory)
-            
+            refresh: Read the directory even if a recent listing is cached
+
         Returns:
             List of DirectoryItem objects representing files and folders
         """
@@ -45,47 +403,81 @@ class FilesystemStorageProvider(StorageProviderBase):
         else:
             target_dir = self.root_path
 
-        if not target_dir.is_dir():
+        try:
+            dir_stat = os.stat(target_dir)
+        except (OSError, ValueError):
+            dir_stat = None
+        if dir_stat is None or not stat_module.S_ISDIR(dir_stat.st_mode):
             # Directory doesn't exist, return empty list
             return []
 
+        # Serve recently listed directories from memory while no entry has been
+        # added, removed or renamed
+        cache_key = (self._root_str, str(target_dir))
+        version = (dir_stat.st_mtime_ns, dir_stat.st_ctime_ns)
+        if self.dir_cache_ttl > 0 and not refresh:
+            with self._dir_cache_lock:
+                cached = self._dir_cache.get(cache_key)
+                if (
+                    cached
+                    and cached[1] == version
+                    and time.monotonic() - cached[0] < self.dir_cache_ttl
+                ):
+                    self._dir_cache.move_to_end(cache_key)
+                    return list(cached[2])
+
         items: List[DirectoryItem] = []
-        
+
+        # Object keys of children are this directory's key plus the entry name
+        rel_dir = str(target_dir.relative_to(self.root_path))
+        key_prefix = "/" if rel_dir == "." else "/" + rel_dir + "/"
+
         try:
-            # List immediate children only (no recursion)
-            for item_path in target_dir.iterdir():
-                if item_path.is_dir():
-                    # This is a folder
-                    items.append(DirectoryItem(
-                        name=item_path.name,
-                        is_folder=True,
-                        object_key=None,  # Folders don't have object keys
-                        size=None,
-                        last_modified=None,
-                        mimetype=None,
-                    ))
-                elif item_path.is_file():
-                    # This is a file
-                    rel_path = "/" + str(item_path.relative_to(self.root_path))
-                    stat = item_path.stat()
-                    last_modified = datetime.fromtimestamp(
-                        stat.st_mtime, tz=timezone.utc
-                    ).isoformat()
-                    mime_type, _ = mimetypes.guess_type(rel_path)
-                    
-                    items.append(DirectoryItem(
-                        name=item_path.name,
-                        is_folder=False,
-                        object_key=rel_path,
-                        size=stat.st_size,
-                        last_modified=last_modified,
-                        mimetype=mime_type,
-                    ))
+            # List immediate children only (no recursion). DirEntry caches the
+            # file type from readdir and the stat result, so each entry costs
+            # at most one stat call.
+            with os.scandir(target_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # This is a folder
+                        items.append(
+                            DirectoryItem(
+                                name=entry.name,
+                                is_folder=True,
+                                object_key=None,  # Folders don't have object keys
+                                size=None,
+                                last_modified=None,
+                                mimetype=None,
+                            )
+                        )
+                    elif entry.is_file():
+                        # This is a file
+                        rel_path = key_prefix + entry.name
+                        stat = entry.stat()
+                        last_modified = _iso_utc(stat.st_mtime)
+                        mime_type = guess_mimetype(rel_path)
+
+                        items.append(
+                            DirectoryItem(
+                                name=entry.name,
+                                is_folder=False,
+                                object_key=rel_path,
+                                size=stat.st_size,
+                                last_modified=last_modified,
+                                mimetype=mime_type,
+                            )
+                        )
 
             # Sort items: folders first, then files, both alphabetically
             items.sort(key=lambda x: (not x.is_folder, x.name.lower()))
-            
-            return items
+
+            if self.dir_cache_ttl > 0:
+                with self._dir_cache_lock:
+                    self._dir_cache[cache_key] = (time.monotonic(), version, items)
+                    self._dir_cache.move_to_end(cache_key)
+                    if len(self._dir_cache) > DIR_CACHE_ENTRIES:
+                        self._dir_cache.popitem(last=False)
+            return list(items)
 
         except (PermissionError, OSError):
             # Handle permission errors or other OS errors
@@ -101,47 +493,17 @@ class FilesystemStorageProvider(StorageProviderBase):
         """
         List all files under the root path, optionally filtered by prefix and regex.
         Returns a list of StoredMediaObject instances with filesystem metadata.
+        Pages follow walk order; only files in the requested page are stat'ed,
+        and the walk stops as soon as the page is full.
         """
-        # Walk the filesystem and collect file paths
-        results = []
-        regex_pattern = re.compile(regex) if regex else None
-
-        for dirpath, _, filenames in os.walk(self.root_path):
-            for filename in filenames:
-                full_path = Path(dirpath) / filename
-                rel_path = "/" + str(full_path.relative_to(self.root_path))
-
-                # Apply prefix filter
-                if prefix is not None and not rel_path.startswith(prefix):
-                    continue
-
-                # Apply regex filter if provided
-                if regex_pattern and not regex_pattern.search(rel_path):
-                    continue
-
-                # Get file metadata
-                stat = full_path.stat()
-                last_modified = datetime.fromtimestamp(
-                    stat.st_mtime, tz=timezone.utc
-                ).isoformat()
-
-                mime_type, _ = mimetypes.guess_type(rel_path)
-                results.append(
-                    StoredMediaObject(
-                        object_key=rel_path,
-                        last_modified=last_modified,
-                        metadata={
-                            "size": stat.st_size,
-                            "created": datetime.fromtimestamp(
-                                stat.st_ctime, tz=timezone.utc
-                            ).isoformat(),
-                            "mimetype": mime_type,
-                        },
-                    )
-                )
-
-        # Apply pagination
-        return results[offset : offset + limit]
+        regex_search = compile_search(regex) if regex else None
+        # The walk applies the regex filter, so only matches are stat'ed ahead
+        matches = self._iter_entries(prefix, stat=True, match=regex_search)
+
+        return [
+            self._stored_media_object(entry, rel_path)
+            for entry, rel_path in islice(matches, offset, offset + limit)
+        ]
 
     def all_media_objects(
         self,
@@ -152,62 +514,111 @@ class FilesystemStorageProvider(StorageProviderBase):
         Yield all files under the root path, optionally filtered by prefix and regex.
         Returns an iterable of StoredMediaObject instances with filesystem metadata.
         """
-        regex_pattern = re.compile(regex) if regex else None
-
-        for dirpath, _, filenames in os.walk(self.root_path):
-            for filename in filenames:
-                full_path = Path(dirpath) / filename
-                # Skip directories, symlinks, etc. - ensure it's a file
-                if not full_path.is_file():
-                    continue
-
-                rel_path = "/" + str(full_path.relative_to(self.root_path))
-
-                # Apply prefix filter
-                if prefix is not None and not rel_path.startswith(prefix):
-                    continue
-
-                # Apply regex filter if provided
-                if regex_pattern and not regex_pattern.search(rel_path):
-                    continue
-
-                # Get file metadata
-                stat = full_path.stat()
-                last_modified = datetime.fromtimestamp(
-                    stat.st_mtime, tz=timezone.utc
-                ).isoformat()
-
-                mime_type, _ = mimetypes.guess_type(rel_path)
-                yield StoredMediaObject(
-                    object_key=rel_path,
-                    last_modified=last_modified,
-                    metadata={
-                        "size": stat.st_size,
-                        "created": datetime.fromtimestamp(
-                            stat.st_ctime, tz=timezone.utc
-                        ).isoformat(),
-                        "mimetype": mime_type,
-                    },
-                )
+        regex_search = compile_search(regex) if regex else None
+
+        # The walk applies the regex filter, so only matches are stat'ed ahead
+        for entry, rel_path in self._iter_entries(
+            prefix, stat=True, match=regex_search
+        ):
+            # Skip broken symlinks, sockets, etc. - ensure it's a file
+            if not entry.is_file():
+                continue
+
+            yield self._stored_media_object(entry, rel_path)
+
+    async def all_media_objects_async(
+        self,
+        prefix: Optional[str] = None,
+        regex: Optional[str] = None,
+    ) -> AsyncIterator[StoredMediaObject]:
+        """
+        Async version of all_media_objects. The walk runs on a worker thread and
+        hands objects over in batches, so the event loop stays free and the
+        caller's own awaits overlap with the scan. The thread stays at most
+        ASYNC_QUEUE_BATCHES batches ahead, and stops if the caller stops early.
+        """
+        loop = asyncio.get_running_loop()
+        # Lists of objects, an empty list once the walk is done, or the
+        # exception that ended it
+        queue: asyncio.Queue = asyncio.Queue()
+        free_slots = threading.Semaphore(ASYNC_QUEUE_BATCHES)
+        stopped = threading.Event()
+
+        def scan() -> None:
+            try:
+                objects = iter(self.all_media_objects(prefix, regex))
+                while True:
+                    free_slots.acquire()
+                    if stopped.is_set():
+                        return
+                    batch = list(islice(objects, ASYNC_BATCH_SIZE))
+                    loop.call_soon_threadsafe(queue.put_nowait, batch)
+                    if not batch:
+                        return
+            except Exception as e:
+                if not stopped.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        loop.run_in_executor(None, scan)
+        try:
+            while True:
+                batch = await queue.get()
+                if isinstance(batch, Exception):
+                    raise batch
+                if not batch:
+                    return
+                free_slots.release()
+                for media_object in batch:
+                    yield media_object
+        finally:
+            stopped.set()
+            # Wake the thread if it is waiting for room, so it can notice
+            free_slots.release()
 
     async def retrieve(self, object_key: str) -> bytes:
         """
         Retrieve the raw bytes of a file given its object key (relative path from root).
+        The check and the read run together on a worker thread, so the event loop
+        keeps serving other requests while the file is read.
+        """
+        return await asyncio.to_thread(self._retrieve_sync, object_key)
+
+    def _retrieve_sync(self, object_key: str) -> bytes:
+        with self._open_object(object_key) as f:
+            return f.read()
+
+    def _open_object(self, object_key: str) -> BinaryIO:
+        """Open an object's file for unbuffered reading.
+
+        Opens first and checks the type with fstat on the open descriptor, so
+        there is no separate stat of the path. Anything but a regular file (or
+        a symlink to one) raises FileNotFoundError, as the earlier isfile()
+        check did; permission errors on the file itself propagate.
         """
         # Remove leading slash for filesystem path resolution
-        rel_path = object_key.lstrip("/")
-        file_path = self.root_path / rel_path
-        if not file_path.is_file():
-            raise FileNotFoundError(
-                f"Object '{object_key}' not found in filesystem storage."
-            )
-        return file_path.read_bytes()
+        file_path = os.path.join(self._root_str, object_key.lstrip("/"))
+        try:
+            f = open(file_path, "rb", buffering=0, opener=_open_nonblocking)
+        except PermissionError:
+            raise
+        except (OSError, ValueError):
+            pass
+        else:
+            if stat_module.S_ISREG(os.fstat(f.fileno()).st_mode):
+                return f
+            f.close()
+        raise FileNotFoundError(
+            f"Object '{object_key}' not found in filesystem storage."
+        )
 
-    def iter_object_bytes(self, object_key: str) -> Iterable[bytes]:
+    def iter_object_bytes(
+        self, object_key: str, chunk_size: int = OBJECT_CHUNK_SIZE
+    ) -> Iterable[bytes]:
         """Yield bytes of a single media object in chunks.
 
         Args:
             object_key: Key of the object to retrieve
+            chunk_size: Largest chunk to yield
 
         Yields:
             Chunks of bytes from the object
@@ -215,35 +626,28 @@ class FilesystemStorageProvider(StorageProviderBase):
         Raises:
             FileNotFoundError: If the object doesn't exist
         """
-        file_path = self.root_path / object_key.lstrip("/")
-        if not file_path.is_file():
-            raise FileNotFoundError(
-                f"Object '{object_key}' not found in filesystem storage."
-            )
-
-        with file_path.open("rb") as f:
-            while chunk := f.read(4096):  # 4KB chunks
+        # Unbuffered: every read is already chunk-sized, so a buffer would only
+        # add a copy
+        with self._open_object(object_key) as f:
+            while chunk := f.read(chunk_size):
                 yield chunk
 
     def count(
         self,
         prefix: Optional[str] = None,
         regex: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> int:
         """
         Return the total count of media objects, optionally filtered by prefix and regex.
+        Stops walking once `limit` matches have been found, if given.
         """
-        regex_pattern = re.compile(regex) if regex else None
-        count = 0
-        for dirpath, _, filenames in os.walk(self.root_path):
-            for filename in filenames:
-                full_path = Path(dirpath) / filename
-                if not full_path.is_file():
-                    continue
-                rel_path = "/" + str(full_path.relative_to(self.root_path))
-                if prefix is not None and not rel_path.startswith(prefix):
-                    continue
-                if regex_pattern and not regex_pattern.search(rel_path):
-                    continue
-                count += 1
-        return count
+        regex_search = compile_search(regex) if regex else None
+        # File types come from the directory listing, so nothing is stat'ed here
+        # except symlinks, and sum() keeps the tally out of the interpreter loop
+        matches = (
+            1
+            for entry, rel_path in self._iter_entries(prefix)
+            if entry.is_file() and (regex_search is None or regex_search(rel_path))
+        )
+        return sum(islice(matches, limit))
@@ -0,0 +1,509 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from dropbox.exceptions import ApiError, InternalServerError, RateLimitError
+from dropbox.files import (
+    DeletedMetadata,
+    FileMetadata,
+    FolderMetadata,
+    ListFolderContinueError,
+    ListFolderResult,
+)
+
+from app.storage_exceptions import (
+    StorageCursorResetException,
+    StorageProviderException,
+)
+from app.storage_providers.base import OBJECT_CHUNK_SIZE
+from app.storage_providers.dropbox import (
+    RATE_LIMIT_MAX_ATTEMPTS,
+    DropboxStorageProvider,
+)
+
+ROOT = "/test-root"
+
+
+def make_file(path: str) -> FileMetadata:
+    now = datetime.now(timezone.utc)
+    return FileMetadata(
+        name=path.rsplit("/", 1)[1],
+        id=f"id:{path}",
+        client_modified=now,
+        server_modified=now,
+        rev="a1b2c3d4e",
+        size=5,
+        path_lower=path.lower(),
+        path_display=path,
+        is_downloadable=True,
+        content_hash="0" * 64,
+    )
+
+
+def make_folder(path: str) -> FolderMetadata:
+    return FolderMetadata(
+        name=path.rsplit("/", 1)[1],
+        id=f"id:{path}",
+        path_lower=path.lower(),
+        path_display=path,
+    )
+
+
+def paged(entries: List, page_size: int) -> List[ListFolderResult]:
+    """Split entries into ListFolderResult pages chained by cursor."""
+    pages = []
+    for start in range(0, len(entries), page_size):
+        pages.append(
+            ListFolderResult(
+                entries=entries[start : start + page_size],
+                cursor=f"cursor-{start + page_size}",
+                has_more=start + page_size < len(entries),
+            )
+        )
+    return pages
+
+
+@pytest.fixture
+def entries() -> List:
+    return (
+        [make_folder(f"{ROOT}/photos")]
+        + [make_file(f"{ROOT}/photos/img{i}.jpg") for i in range(10)]
+        + [make_file(f"{ROOT}/doc{i}.txt") for i in range(5)]
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_class_caches():
+    DropboxStorageProvider.close_clients()
+    DropboxStorageProvider._file_index.clear()
+    DropboxStorageProvider._dir_cache.clear()
+    DropboxStorageProvider._count_cache.clear()
+    yield
+    DropboxStorageProvider.close_clients()
+    DropboxStorageProvider._file_index.clear()
+    DropboxStorageProvider._dir_cache.clear()
+    DropboxStorageProvider._count_cache.clear()
+
+
+def make_provider(
+    root_path: str = ROOT, refresh_token: str = "dummy-refresh-token"
+) -> DropboxStorageProvider:
+    with patch("dropbox.Dropbox"):
+        provider = DropboxStorageProvider(
+            root_path=root_path,
+            app_key="dummy-app-key",
+            app_secret="dummy-app-secret",
+            refresh_token=refresh_token,
+        )
+    provider.dbx = MagicMock()
+    return provider
+
+
+@pytest.fixture
+def provider() -> DropboxStorageProvider:
+    return make_provider()
+
+
+def install_pages(provider: DropboxStorageProvider, pages: List[ListFolderResult]):
+    provider.dbx.files_list_folder.return_value = pages[0]
+    by_cursor = {page.cursor: page for page in pages}
+    provider.dbx.files_list_folder_continue.side_effect = lambda cursor: pages[
+        pages.index(by_cursor[cursor]) + 1
+    ]
+
+
+def test_count_follows_every_page(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    assert provider.count() == 15
+    assert provider.dbx.files_list_folder_continue.call_count == 3
+
+
+def test_count_with_prefix_and_regex(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(prefix="/photos") == 10
+
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(regex=r"img[0-4]\.jpg$") == 5
+
+
+def test_repeat_count_applies_cursor_deltas(provider, entries):
+    provider.count_cache_ttl = 0
+    pages = paged(entries, 4)
+    install_pages(provider, pages)
+    assert provider.count() == 15
+
+    provider.dbx.reset_mock(side_effect=True)
+    provider.dbx.files_list_folder_continue.return_value = ListFolderResult(
+        entries=[
+            make_file(f"{ROOT}/new.txt"),
+            DeletedMetadata(name="doc0.txt", path_lower=f"{ROOT}/doc0.txt"),
+            DeletedMetadata(name="photos", path_lower=f"{ROOT}/photos"),
+        ],
+        cursor="cursor-delta",
+        has_more=False,
+    )
+    assert provider.count() == 5
+    provider.dbx.files_list_folder.assert_not_called()
+    provider.dbx.files_list_folder_continue.assert_called_once_with(pages[-1].cursor)
+
+
+def test_count_index_is_not_locked_during_dropbox_calls(provider, entries):
+    provider.count_cache_ttl = 0
+    lock = DropboxStorageProvider._file_index_lock
+    pages = paged(entries, 4)
+    install_pages(provider, pages)
+    listed = provider.dbx.files_list_folder.return_value
+
+    def list_folder(*args, **kwargs):
+        assert not lock.locked()
+        return listed
+
+    provider.dbx.files_list_folder.side_effect = list_folder
+    assert provider.count() == 15
+    _, files = DropboxStorageProvider._file_index[(provider._account, ROOT.lower())]
+
+    def list_folder_continue(cursor):
+        assert not lock.locked()
+        return ListFolderResult(
+            entries=[make_file(f"{ROOT}/new.txt")],
+            cursor="cursor-delta",
+            has_more=False,
+        )
+
+    provider.dbx.files_list_folder_continue.side_effect = list_folder_continue
+    assert provider.count() == 16
+    # The stored set was replaced, not changed in place
+    assert len(files) == 15
+
+
+def test_failed_delta_leaves_count_index_intact(provider, entries, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.dropbox.time.sleep", lambda s: None)
+    provider.count_cache_ttl = 0
+    install_pages(provider, paged(entries, 4))
+    assert provider.count() == 15
+    index_key = (provider._account, ROOT.lower())
+    state = DropboxStorageProvider._file_index[index_key]
+
+    provider.dbx.files_list_folder_continue.side_effect = [
+        ListFolderResult(
+            entries=[make_file(f"{ROOT}/new.txt")], cursor="cursor-a", has_more=True
+        ),
+    ] + [InternalServerError("req", 500, "boom")] * 10
+    with pytest.raises(StorageProviderException):
+        provider.count()
+    assert DropboxStorageProvider._file_index[index_key] is state
+    assert len(state[1]) == 15
+
+
+def test_count_index_is_per_account(provider, entries):
+    provider.count_cache_ttl = 0
+    install_pages(provider, paged(entries, 4))
+    assert provider.count() == 15
+
+    other = make_provider(refresh_token="other-token")
+    other.count_cache_ttl = 0
+    install_pages(other, paged(entries[:3], 4))
+    assert other.count() == 2
+    other.dbx.files_list_folder_continue.assert_not_called()
+
+
+def test_count_index_is_bounded(provider, entries, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.dropbox.FILE_INDEX_ENTRIES", 1)
+    provider.count_cache_ttl = 0
+    install_pages(provider, paged(entries, 4))
+    provider.count()
+    other_root = make_provider(root_path="/other-root")
+    other_root.count_cache_ttl = 0
+    install_pages(other_root, paged(entries, 4))
+    other_root.count()
+    assert list(DropboxStorageProvider._file_index) == [
+        (other_root._account, "/other-root")
+    ]
+
+
+def test_count_limit_stops_paging_early(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(limit=3) == 3
+    # At most the one prefetched continuation page was requested
+    assert provider.dbx.files_list_folder_continue.call_count <= 1
+
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(prefix="/photos", limit=6) == 6
+
+
+def test_rate_limited_calls_are_retried(provider, entries, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(
+        "app.storage_providers.dropbox.time.sleep", lambda s: sleeps.append(s)
+    )
+    pages = paged(entries, 4)
+    install_pages(provider, pages)
+    provider.dbx.files_list_folder.side_effect = [
+        RateLimitError("req", backoff=3),
+        pages[0],
+    ]
+    provider.dbx.files_list_folder.return_value = None
+
+    assert provider.count(prefix="/photos") == 10
+    assert sleeps == [3]
+
+
+def test_server_errors_are_retried_with_exponential_backoff(
+    provider, entries, monkeypatch
+):
+    sleeps = []
+    monkeypatch.setattr(
+        "app.storage_providers.dropbox.time.sleep", lambda s: sleeps.append(s)
+    )
+    pages = paged(entries, 4)
+    install_pages(provider, pages)
+    provider.dbx.files_list_folder.side_effect = [
+        InternalServerError("req", 503, "unavailable"),
+        InternalServerError("req", 503, "unavailable"),
+        pages[0],
+    ]
+
+    assert provider.count(prefix="/photos") == 10
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1 and 0 <= sleeps[1] <= 2
+
+
+def test_rate_limit_gives_up_after_max_attempts(provider, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.dropbox.time.sleep", lambda s: None)
+    provider.dbx.files_list_folder.side_effect = RateLimitError("req")
+
+    with pytest.raises(StorageProviderException):
+        provider.count(prefix="/photos")
+    assert provider.dbx.files_list_folder.call_count == RATE_LIMIT_MAX_ATTEMPTS
+
+
+def test_count_regex_anchored_on_prefix(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(prefix="/photos", regex=r"^photos/img[0-4]\.jpg$") == 5
+
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(prefix="/photos", regex=r"^photos/img{2}") == 0
+
+
+def test_count_matches_listing_when_root_casing_differs(provider):
+    provider.root_path = "/photos"
+    provider._root_prefix = "/photos/"
+    files = [make_file("/Photos/a.jpg"), make_file("/Photos/sub/b.jpg")]
+
+    install_pages(provider, paged(files, 10))
+    assert len(provider.list_media_objects(regex="jpg")) == 2
+
+    install_pages(provider, paged(files, 10))
+    assert provider.count(regex="jpg") == 2
+
+
+def test_count_cache_is_bounded(provider, entries, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.dropbox.COUNT_CACHE_ENTRIES", 2)
+    for regex in ("a", "b", "c"):
+        install_pages(provider, paged(entries, 4))
+        provider.count(regex=regex)
+    assert [key[3] for key in DropboxStorageProvider._count_cache] == ["b", "c"]
+
+
+def test_count_cache_is_per_account(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(regex="doc") == 5
+
+    other = make_provider(refresh_token="other-token")
+    install_pages(other, paged(entries[:3], 4))
+    assert other.count(regex="doc") == 0
+
+
+def test_list_directory_served_from_cache(provider, entries, monkeypatch):
+    provider.dbx.files_list_folder.return_value = ListFolderResult(
+        entries=entries, cursor="cursor", has_more=False
+    )
+    first = provider.list_directory()
+    assert [item.name for item in first[:2]] == ["photos", "doc0.txt"]
+    assert provider.list_directory() == first
+    provider.dbx.files_list_folder.assert_called_once()
+
+    # Once the entry is older than the TTL, Dropbox is listed again
+    now = time.monotonic()
+    monkeypatch.setattr(
+        "app.storage_providers.dropbox.time.monotonic",
+        lambda: now + provider.dir_cache_ttl + 1,
+    )
+    provider.list_directory()
+    assert provider.dbx.files_list_folder.call_count == 2
+
+
+def test_list_directory_refresh_bypasses_cache(provider, entries):
+    provider.dbx.files_list_folder.return_value = ListFolderResult(
+        entries=entries[:3], cursor="cursor", has_more=False
+    )
+    assert len(provider.list_directory()) == 3
+
+    provider.dbx.files_list_folder.return_value = ListFolderResult(
+        entries=entries, cursor="cursor", has_more=False
+    )
+    assert len(provider.list_directory()) == 3
+    assert len(provider.list_directory(refresh=True)) == 16
+    # The fresh listing replaces the cached one
+    assert len(provider.list_directory()) == 16
+    assert provider.dbx.files_list_folder.call_count == 2
+
+
+def test_list_directory_cache_is_per_account(provider, entries):
+    provider.dbx.files_list_folder.return_value = ListFolderResult(
+        entries=entries, cursor="cursor", has_more=False
+    )
+    assert len(provider.list_directory()) == 16
+
+    other = make_provider(refresh_token="other-token")
+    other.dbx.files_list_folder.return_value = ListFolderResult(
+        entries=entries[:3], cursor="cursor", has_more=False
+    )
+    assert len(other.list_directory()) == 3
+    assert len(provider.list_directory()) == 16
+
+
+def test_list_directory_cache_is_bounded(provider, entries, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.dropbox.DIR_CACHE_ENTRIES", 2)
+    provider.dbx.files_list_folder.return_value = ListFolderResult(
+        entries=entries, cursor="cursor", has_more=False
+    )
+    for path in ("/a", "/b", "/c"):
+        provider.list_directory(prefix=path)
+    assert [key[-1] for key in DropboxStorageProvider._dir_cache] == [
+        f"{ROOT}/b".lower(),
+        f"{ROOT}/c".lower(),
+    ]
+
+
+def test_all_media_objects_follows_every_page(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    keys = [obj.object_key for obj in provider.all_media_objects()]
+    assert len(keys) == 15
+    assert keys[0] == "photos/img0.jpg"
+    assert provider.dbx.files_list_folder_continue.call_count == 3
+
+
+def test_list_media_objects_stops_once_window_is_filled(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    objects = provider.list_media_objects(limit=2, offset=1)
+    assert [obj.object_key for obj in objects] == [
+        "photos/img1.jpg",
+        "photos/img2.jpg",
+    ]
+    provider.dbx.files_list_folder_continue.assert_not_called()
+
+
+def test_clients_are_shared_per_credentials():
+    with patch("dropbox.Dropbox", side_effect=lambda **kwargs: MagicMock()) as client:
+        first = DropboxStorageProvider(ROOT, "key", "secret", "token")
+        second = DropboxStorageProvider("/other", "key", "secret", "token")
+        third = DropboxStorageProvider(ROOT, "key", "secret", "other-token")
+
+    assert first.dbx is second.dbx
+    assert third.dbx is not first.dbx
+    assert client.call_count == 2
+    # Retries are left to _call_with_retry alone
+    assert client.call_args.kwargs["max_retries_on_error"] == 0
+    assert client.call_args.kwargs["max_retries_on_rate_limit"] == 0
+
+
+def test_all_media_objects_delta_returns_changes_since_cursor(provider, entries):
+    install_pages(provider, paged(entries, 4))
+    objects, deleted, cursor = provider.all_media_objects_delta()
+    assert len(objects) == 15 and deleted == []
+    assert cursor == "cursor-16"
+
+    provider.dbx.reset_mock(side_effect=True)
+    provider.dbx.files_list_folder_continue.return_value = ListFolderResult(
+        entries=[
+            make_file(f"{ROOT}/new.jpg"),
+            DeletedMetadata(
+                name="doc0.txt",
+                path_lower=f"{ROOT}/doc0.txt",
+                path_display=f"{ROOT}/doc0.txt",
+            ),
+        ],
+        cursor="cursor-delta",
+        has_more=False,
+    )
+    objects, deleted, cursor = provider.all_media_objects_delta(cursor, regex=r"\.jpg$")
+    assert [obj.object_key for obj in objects] == ["new.jpg"]
+    assert deleted == ["doc0.txt"]
+    assert cursor == "cursor-delta"
+    provider.dbx.files_list_folder.assert_not_called()
+
+
+def test_all_media_objects_delta_reports_reset_cursor(provider):
+    provider.dbx.files_list_folder_continue.side_effect = ApiError(
+        "req", ListFolderContinueError.reset, None, None
+    )
+    with pytest.raises(StorageCursorResetException):
+        provider.all_media_objects_delta("stale-cursor")
+
+
+def test_all_media_objects_lists_subfolders_in_parallel(provider, entries):
+    tree = (
+        entries
+        + [make_folder(f"{ROOT}/more")]
+        + [make_file(f"{ROOT}/more/clip{i}.mov") for i in range(3)]
+    )
+
+    def list_folder(path, recursive=False, **kwargs):
+        below = [e for e in tree if e.path_lower.startswith(path.lower() + "/")]
+        if not recursive:
+            below = [e for e in below if "/" not in e.path_lower[len(path) + 1 :]]
+        return ListFolderResult(entries=below, cursor="cursor", has_more=False)
+
+    provider.dbx.files_list_folder.side_effect = list_folder
+    provider.list_workers = 2
+
+    keys = sorted(obj.object_key for obj in provider.all_media_objects())
+    assert keys == sorted(
+        e.path_display[len(ROOT) + 1 :] for e in tree if type(e) is FileMetadata
+    )
+    assert provider.dbx.files_list_folder.call_count == 3
+
+
+def test_iter_object_bytes_streams_and_closes_response(provider):
+    response = MagicMock()
+    response.iter_content.return_value = iter([b"hello ", b"world"])
+    provider.dbx.files_download.return_value = (make_file(f"{ROOT}/a.txt"), response)
+
+    assert b"".join(provider.iter_object_bytes("a.txt")) == b"hello world"
+    provider.dbx.files_download.assert_called_once_with(f"{ROOT}/a.txt")
+    response.iter_content.assert_called_once_with(OBJECT_CHUNK_SIZE)
+    response.close.assert_called_once()
+
+
+def test_count_results_are_reused_within_ttl(provider, entries, monkeypatch):
+    install_pages(provider, paged(entries, 4))
+    assert provider.count(prefix="/photos") == 10
+    assert provider.count(prefix="/photos") == 10
+    provider.dbx.files_list_folder.assert_called_once()
+
+    now = time.monotonic()
+    monkeypatch.setattr(
+        "app.storage_providers.dropbox.time.monotonic",
+        lambda: now + provider.count_cache_ttl + 1,
+    )
+    install_pages(provider, paged(entries[:5], 4))
+    assert provider.count(prefix="/photos") == 4
+
+
+@pytest.mark.asyncio
+async def test_retrieve_downloads_off_the_event_loop(provider):
+
+    loop_thread = threading.get_ident()
+    download_threads = []
+
+    def download(path):
+        download_threads.append(threading.get_ident())
+        return make_file(f"{ROOT}/a.txt"), MagicMock(content=b"hello")
+
+    provider.dbx.files_download.side_effect = download
+    assert await provider.retrieve("/a.txt") == b"hello"
+    assert download_threads and download_threads[0] != loop_thread
@@ -0,0 +1,398 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.storage_providers.base import OBJECT_CHUNK_SIZE
+from app.storage_providers.filesystem import FilesystemStorageProvider
+
+
+@pytest.fixture(autouse=True)
+def clear_class_caches():
+    FilesystemStorageProvider._metadata_cache.clear()
+    FilesystemStorageProvider._dir_index.clear()
+    FilesystemStorageProvider._dir_cache.clear()
+    yield
+    FilesystemStorageProvider._metadata_cache.clear()
+    FilesystemStorageProvider._dir_index.clear()
+    FilesystemStorageProvider._dir_cache.clear()
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    (tmp_path / "a.jpg").write_text("a")
+    (tmp_path / "photos").mkdir()
+    (tmp_path / "photos/x.jpg").write_text("x")
+    (tmp_path / "photos/y.png").write_text("y")
+    return tmp_path
+
+
+def keys(objects) -> list:
+    return [media_object.object_key for media_object in objects]
+
+
+def test_nested_roots_do_not_share_metadata(tree):
+    outer = FilesystemStorageProvider(root_path=str(tree))
+    inner = FilesystemStorageProvider(root_path=str(tree / "photos"))
+
+    assert "/photos/x.jpg" in keys(outer.all_media_objects())
+    assert keys(inner.all_media_objects(regex="x")) == ["/x.jpg"]
+    assert "/photos/x.jpg" in keys(outer.all_media_objects())
+
+
+@pytest.mark.asyncio
+async def test_all_media_objects_async(tree):
+    provider = FilesystemStorageProvider(root_path=str(tree))
+    found = [obj.object_key async for obj in provider.all_media_objects_async()]
+    assert found == keys(provider.all_media_objects())
+    assert len(found) == 3
+
+    found = [
+        obj.object_key
+        async for obj in provider.all_media_objects_async(prefix="/photos")
+    ]
+    assert found == keys(provider.all_media_objects(prefix="/photos"))
+    assert sorted(found) == ["/photos/x.jpg", "/photos/y.png"]
+
+
+def names(items) -> list:
+    return [item.name for item in items]
+
+
+def test_list_directory_cache_hit(tree, monkeypatch):
+    provider = FilesystemStorageProvider(root_path=str(tree))
+    first = provider.list_directory("/photos")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("directory read again")
+
+    monkeypatch.setattr("app.storage_providers.filesystem.os.scandir", fail)
+    assert provider.list_directory("/photos") == first
+
+
+def test_list_directory_cache_is_per_root(tree):
+    outer = FilesystemStorageProvider(root_path=str(tree))
+    inner = FilesystemStorageProvider(root_path=str(tree / "photos"))
+
+    assert [i.object_key for i in outer.list_directory("/photos")] == [
+        "/photos/x.jpg",
+        "/photos/y.png",
+    ]
+    assert [i.object_key for i in inner.list_directory()] == ["/x.jpg", "/y.png"]
+
+
+def test_list_directory_cache_sees_new_entries(tree):
+    provider = FilesystemStorageProvider(root_path=str(tree))
+    assert names(provider.list_directory("/photos")) == ["x.jpg", "y.png"]
+
+    (tree / "photos/z.jpg").write_text("z")
+    assert names(provider.list_directory("/photos")) == ["x.jpg", "y.png", "z.jpg"]
+
+
+def test_list_directory_cache_sees_restored_mtime(tree):
+    provider = FilesystemStorageProvider(root_path=str(tree))
+    photos = tree / "photos"
+    before = photos.stat()
+    assert names(provider.list_directory("/photos")) == ["x.jpg", "y.png"]
+
+    # Only ctime is left to tell the directory changed
+    (photos / "x.jpg").unlink()
+    os.utime(photos, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert names(provider.list_directory("/photos")) == ["y.png"]
+
+
+def test_list_directory_cache_expires(tree, monkeypatch):
+    provider = FilesystemStorageProvider(root_path=str(tree), dir_cache_ttl=2.0)
+    now = [1000.0]
+    monkeypatch.setattr(
+        "app.storage_providers.filesystem.time.monotonic", lambda: now[0]
+    )
+    assert provider.list_directory("/photos")[0].size == 1
+
+    # Rewriting a file in place leaves the directory's timestamps alone
+    (tree / "photos/x.jpg").write_text("longer")
+    assert provider.list_directory("/photos")[0].size == 1
+    now[0] += 2.0
+    assert provider.list_directory("/photos")[0].size == 6
+
+
+def test_list_directory_cache_disabled(tree):
+    provider = FilesystemStorageProvider(root_path=str(tree), dir_cache_ttl=0)
+    provider.list_directory("/photos")
+    assert not FilesystemStorageProvider._dir_cache
+
+
+def test_list_directory_cache_is_bounded(tree, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.filesystem.DIR_CACHE_ENTRIES", 1)
+    provider = FilesystemStorageProvider(root_path=str(tree))
+    provider.list_directory()
+    provider.list_directory("/photos")
+    assert list(FilesystemStorageProvider._dir_cache) == [
+        (str(tree), str(tree / "photos"))
+    ]
+
+
+@pytest.fixture
+def deep_tree(tmp_path: Path) -> Path:
+    for i in range(6):
+        for j in range(4):
+            album = tmp_path / f"year{i}" / f"album{j}"
+            album.mkdir(parents=True)
+            for k in range(3):
+                (album / f"img{k}.jpg").write_text("x")
+        (tmp_path / f"year{i}" / "cover.png").write_text("x")
+    (tmp_path / "top.jpg").write_text("x")
+    return tmp_path
+
+
+def test_parallel_walk_matches_serial_order(deep_tree):
+    serial = FilesystemStorageProvider(root_path=str(deep_tree))
+    parallel = FilesystemStorageProvider(root_path=str(deep_tree), scan_workers=4)
+
+    assert len(keys(serial.all_media_objects())) == 6 * 4 * 3 + 6 + 1
+    assert keys(parallel.all_media_objects()) == keys(serial.all_media_objects())
+    assert keys(parallel.all_media_objects(prefix="/year3", regex="jpg")) == keys(
+        serial.all_media_objects(prefix="/year3", regex="jpg")
+    )
+    assert keys(parallel.list_media_objects(limit=10, offset=20)) == keys(
+        serial.list_media_objects(limit=10, offset=20)
+    )
+
+
+def test_parallel_walk_scans_a_bounded_distance_ahead(deep_tree, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.filesystem.SCAN_AHEAD_PER_WORKER", 1)
+    provider = FilesystemStorageProvider(root_path=str(deep_tree), scan_workers=2)
+    scanned = []
+    scan_dir = provider._scan_dir
+
+    def recording_scan_dir(dirpath, *args):
+        scanned.append(dirpath)
+        return scan_dir(dirpath, *args)
+
+    monkeypatch.setattr(provider, "_scan_dir", recording_scan_dir)
+    walk = provider._iter_entries()
+    # /top.jpg, then /year0/cover.png
+    next(walk)
+    next(walk)
+    time.sleep(0.2)
+    # The root, then at most two directories in flight (2 workers x 1 ahead)
+    assert len(scanned) <= 3
+    walk.close()
+
+
+def os_walk_keys(root: Path) -> list:
+    """Object keys in the order the original os.walk-based listing produced."""
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.isfile(path):
+                found.append("/" + os.path.relpath(path, root))
+    return found
+
+
+@pytest.fixture
+def odd_tree(deep_tree: Path) -> Path:
+    (deep_tree / "linked-dir").symlink_to(deep_tree / "year1")
+    (deep_tree / "linked.jpg").symlink_to(deep_tree / "top.jpg")
+    (deep_tree / "broken.jpg").symlink_to(deep_tree / "missing.jpg")
+    os.mkfifo(deep_tree / "year2" / "pipe.jpg")
+    return deep_tree
+
+
+@pytest.mark.parametrize("scan_workers", [1, 4])
+def test_walk_matches_os_walk(odd_tree, scan_workers):
+    provider = FilesystemStorageProvider(
+        root_path=str(odd_tree), scan_workers=scan_workers
+    )
+    expected = os_walk_keys(odd_tree)
+    assert "/linked.jpg" in expected
+
+    assert keys(provider.all_media_objects()) == expected
+    assert provider.count() == len(expected)
+
+
+def test_walk_skips_unreadable_directories(deep_tree, monkeypatch):
+    scandir = os.scandir
+    blocked = str(deep_tree / "year1")
+
+    def guarded_scandir(path):
+        if str(path) == blocked:
+            raise PermissionError(path)
+        return scandir(path)
+
+    monkeypatch.setattr("app.storage_providers.filesystem.os.scandir", guarded_scandir)
+    provider = FilesystemStorageProvider(root_path=str(deep_tree))
+    found = keys(provider.all_media_objects())
+    assert found == [key for key in os_walk_keys(deep_tree) if "/year1/" not in key]
+
+
+def record_scans(provider, monkeypatch) -> list:
+    scanned = []
+    scan_dir = provider._scan_dir
+
+    def recording_scan_dir(dirpath, *args):
+        scanned.append(dirpath)
+        return scan_dir(dirpath, *args)
+
+    monkeypatch.setattr(provider, "_scan_dir", recording_scan_dir)
+    return scanned
+
+
+def test_prefix_prunes_walk(deep_tree, monkeypatch):
+    provider = FilesystemStorageProvider(root_path=str(deep_tree))
+    scanned = record_scans(provider, monkeypatch)
+
+    found = keys(provider.all_media_objects(prefix="/year3/album1/"))
+    assert found == [
+        key for key in os_walk_keys(deep_tree) if key.startswith("/year3/album1/")
+    ]
+    assert len(found) == 3
+    assert scanned == [
+        str(deep_tree),
+        str(deep_tree / "year3"),
+        str(deep_tree / "year3/album1"),
+    ]
+
+
+def test_prefix_is_a_plain_string_prefix(deep_tree):
+    (deep_tree / "year3x.jpg").write_text("x")
+    provider = FilesystemStorageProvider(root_path=str(deep_tree))
+
+    found = keys(provider.all_media_objects(prefix="/year3"))
+    assert found == [key for key in os_walk_keys(deep_tree) if key.startswith("/year3")]
+    assert "/year3x.jpg" in found
+    assert keys(provider.all_media_objects(prefix="/Year3")) == []
+    assert provider.count(prefix="//") == 0
+
+
+def test_metadata_is_reused_until_the_file_changes(tree):
+    provider = FilesystemStorageProvider(root_path=str(tree))
+    first = provider.list_media_objects(regex="x")[0]
+    assert provider.list_media_objects(regex="x")[0] == first
+    assert len(FilesystemStorageProvider._metadata_cache) == 1
+
+    (tree / "photos/x.jpg").write_text("longer")
+    changed = provider.list_media_objects(regex="x")[0]
+    assert changed.metadata["size"] == 6
+    assert changed.last_modified >= first.last_modified
+
+
+def test_cached_metadata_is_not_shared_between_callers(tree):
+    provider = FilesystemStorageProvider(root_path=str(tree))
+    first = provider.list_media_objects(regex="x")[0]
+    first.metadata["ingested"] = True
+    first.last_modified = None
+
+    again = provider.list_media_objects(regex="x")[0]
+    assert again is not first
+    assert "ingested" not in again.metadata
+    assert again.last_modified is not None
+
+
+def test_recently_changed_directories_are_not_indexed(deep_tree):
+    provider = FilesystemStorageProvider(root_path=str(deep_tree))
+    provider.count()
+    # Every directory was just written, inside DIR_INDEX_MIN_AGE_NS
+    assert not FilesystemStorageProvider._dir_index
+
+
+@pytest.fixture
+def indexed_provider(deep_tree, monkeypatch) -> FilesystemStorageProvider:
+    monkeypatch.setattr("app.storage_providers.filesystem.DIR_INDEX_MIN_AGE_NS", 0)
+    provider = FilesystemStorageProvider(root_path=str(deep_tree))
+    # Warm the index, then let the coarse filesystem clock move on
+    provider.count()
+    time.sleep(0.05)
+    return provider
+
+
+def test_index_serves_unchanged_directories(indexed_provider, deep_tree, monkeypatch):
+    expected = keys(indexed_provider.all_media_objects())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("directory read again")
+
+    monkeypatch.setattr("app.storage_providers.filesystem.os.scandir", fail)
+    assert keys(indexed_provider.all_media_objects()) == expected
+
+
+def test_index_sees_added_file(indexed_provider, deep_tree):
+    (deep_tree / "year4/album2/new.jpg").write_text("x")
+    assert "/year4/album2/new.jpg" in keys(indexed_provider.all_media_objects())
+    assert keys(indexed_provider.all_media_objects()) == os_walk_keys(deep_tree)
+
+
+def test_index_sees_removed_file(indexed_provider, deep_tree):
+    (deep_tree / "year4/album2/img1.jpg").unlink()
+    assert keys(indexed_provider.all_media_objects()) == os_walk_keys(deep_tree)
+    assert indexed_provider.count() == 6 * 4 * 3 + 6
+
+
+def test_index_sees_renamed_directory(indexed_provider, deep_tree):
+    (deep_tree / "year4/album2").rename(deep_tree / "year4/renamed")
+    found = keys(indexed_provider.all_media_objects())
+    assert found == os_walk_keys(deep_tree)
+    assert "/year4/renamed/img0.jpg" in found
+    assert not any(key.startswith("/year4/album2/") for key in found)
+
+
+def test_index_sees_change_behind_restored_mtime(indexed_provider, deep_tree):
+    album = deep_tree / "year4/album2"
+    before = album.stat()
+    (album / "img1.jpg").rename(album / "moved.jpg")
+    os.utime(album, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert keys(indexed_provider.all_media_objects()) == os_walk_keys(deep_tree)
+
+
+def freeze_directory_stats(monkeypatch, root: Path) -> None:
+    """Make os.stat report every directory as it is now, like a stale NFS cache."""
+    real_stat = os.stat
+    frozen = {dirpath: real_stat(dirpath) for dirpath, _, _ in os.walk(root)}
+    monkeypatch.setattr(
+        "app.storage_providers.filesystem.os.stat",
+        lambda path, *args, **kwargs: frozen.get(str(path))
+        or real_stat(path, *args, **kwargs),
+    )
+
+
+def test_index_trusts_directory_stats(indexed_provider, deep_tree, monkeypatch):
+    freeze_directory_stats(monkeypatch, deep_tree)
+    (deep_tree / "year4/album2/new.jpg").write_text("x")
+    assert "/year4/album2/new.jpg" not in keys(indexed_provider.all_media_objects())
+
+
+def test_index_can_be_turned_off(deep_tree, monkeypatch):
+    monkeypatch.setattr("app.storage_providers.filesystem.DIR_INDEX_MIN_AGE_NS", 0)
+    provider = FilesystemStorageProvider(root_path=str(deep_tree), dir_index=False)
+    provider.count()
+    assert not FilesystemStorageProvider._dir_index
+
+    freeze_directory_stats(monkeypatch, deep_tree)
+    (deep_tree / "year4/album2/new.jpg").write_text("x")
+    assert "/year4/album2/new.jpg" in keys(provider.all_media_objects())
+
+
+def test_open_object_reads_regular_files_and_links(odd_tree):
+    provider = FilesystemStorageProvider(root_path=str(odd_tree))
+    assert b"".join(provider.iter_object_bytes("/top.jpg", chunk_size=1)) == b"x"
+    assert provider._retrieve_sync("/linked.jpg") == b"x"
+
+
+def test_iter_object_bytes_defaults_to_protocol_chunk_size(tmp_path):
+    (tmp_path / "clip.mov").write_bytes(b"x" * (2 * OBJECT_CHUNK_SIZE + 10))
+    provider = FilesystemStorageProvider(root_path=str(tmp_path))
+    sizes = [len(chunk) for chunk in provider.iter_object_bytes("/clip.mov")]
+    assert sizes == [OBJECT_CHUNK_SIZE, OBJECT_CHUNK_SIZE, 10]
+
+
+@pytest.mark.parametrize(
+    "object_key", ["/year2/pipe.jpg", "/year2", "/missing.jpg", "/broken.jpg"]
+)
+def test_open_object_rejects_anything_but_files(odd_tree, object_key):
+    provider = FilesystemStorageProvider(root_path=str(odd_tree))
+    with pytest.raises(FileNotFoundError):
+        provider._open_object(object_key)
+    with pytest.raises(FileNotFoundError):
+        list(provider.iter_object_bytes(object_key))
@@ -0,0 +1,95 @@
+import mimetypes
+import re
+
+import pytest
+
+from app.storage_providers.base import compile_search, guess_mimetype
+
+SEARCH_SUBJECTS = [
+    "",
+    "abc",
+    "abcd",
+    "xabc",
+    "ABC",
+    "abc\n",
+    "xabc\n",
+    "abc\n\n",
+    "\n",
+    "a\nb",
+    "a.jpg",
+    "axjpg",
+    "2024/photo.jpg",
+    "photos/2024/img.JPG",
+]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["^abc", "abc$", "^abc$", "^", "$", "^$", "^2024/", "^a b$"],
+)
+def test_compile_search_answers_anchored_literals_without_regex(pattern):
+    search = compile_search(pattern)
+    assert not isinstance(getattr(search, "__self__", None), re.Pattern)
+    for subject in SEARCH_SUBJECTS:
+        assert bool(search(subject)) == bool(re.compile(pattern).search(subject))
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "abc",
+        r"^a\.jpg",
+        r"a\.jpg$",
+        r"^a\.jpg$",
+        ".jpg$",
+        "^a.jpg",
+        "abc|xyz",
+        "^abc|xyz$",
+        "^ab+c",
+        "ab*$",
+        "^ab{2}",
+        "^[ab]",
+        r"\babc",
+        r"^\d+/",
+        "(?i)abc$",
+        "^(abc)$",
+    ],
+)
+def test_compile_search_falls_back_to_regex(pattern):
+    search = compile_search(pattern)
+    assert isinstance(getattr(search, "__self__", None), re.Pattern)
+    for subject in SEARCH_SUBJECTS:
+        assert bool(search(subject)) == bool(re.compile(pattern).search(subject))
+
+
+@pytest.mark.parametrize(
+    "object_key",
+    [
+        "/photos/img.jpg",
+        "/photos/IMG.JPG",
+        "/photos/img.Jpeg",
+        "/clips/clip.MOV",
+        "/a/b.png",
+        "/archive.tar.gz",
+        "/ARCHIVE.TAR.GZ",
+        "/archive.tgz",
+        "/archive.TGZ",
+        "/drawing.svgz",
+        "/drawing.SVGZ",
+        "/drawing.svg.gz",
+        "/notes.txt.bz2",
+        "/data.gz",
+        "/.bashrc",
+        "/photos/.hidden.jpg",
+        "/photos/.jpg",
+        "/README",
+        "/photos.d/README",
+        "/trailing.",
+        "/odd:name.jpg",
+        "",
+    ],
+)
+def test_guess_mimetype_matches_mimetypes(object_key):
+    assert guess_mimetype(object_key) == mimetypes.guess_type(object_key)[0]
+    # A second lookup is served from the per-extension cache
+    assert guess_mimetype(object_key) == mimetypes.guess_type(object_key)[0]
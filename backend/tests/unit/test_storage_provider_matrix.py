@@ -124,6 +124,8 @@ def dropbox_provider_with_files(monkeypatch, tmp_path: Path) -> StorageProviderB
                 )
 
         instance.files_download.side_effect = files_download_side_effect
+        # Clients are shared per credentials; make sure this mock is the one used
+        DropboxStorageProvider.close_clients()
         provider = DropboxStorageProvider(
             root_path=os.environ["DROPBOX_ROOT_PATH"],
             app_key=os.environ["DROPBOX_APP_KEY"],